@@ -0,0 +1,31 @@
+"""Shared AWS client construction for AC Server Manager."""
+
+import functools
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+# Adaptive retries rate-limit client-side before AWS starts throttling, and the
+# larger pool lets concurrent calls on a shared client each hold a connection
+CLIENT_CONFIG = Config(
+    retries={"mode": "adaptive", "max_attempts": 10},
+    max_pool_connections=32,
+)
+
+
+@functools.lru_cache(maxsize=16)
+def get_client(service_name: str, region: str) -> Any:
+    """Get a boto3 client, reusing one per service and region.
+
+    Creating a client loads and parses the service model, so managers share
+    clients instead of building their own. boto3 clients are thread-safe.
+
+    Args:
+        service_name: AWS service name (e.g. "ec2", "s3")
+        region: AWS region
+
+    Returns:
+        boto3 client for the service
+    """
+    return boto3.client(service_name, region_name=region, config=CLIENT_CONFIG)
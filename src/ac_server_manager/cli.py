@@ -662,5 +662,42 @@ def status(instance_id: Optional[str], instance_name: str, region: str) -> None:
         click.echo("Start the instance with: ac-server-manager start")
 
 
+@main.command("build-ami")
+@click.option("--instance-id", required=True, help="Provisioned instance to create the AMI from")
+@click.option("--name", help="AMI name (defaults to a timestamped name)")
+@click.option("--region", default="us-east-1", help="AWS region")
+def build_ami(instance_id: str, name: Optional[str], region: str) -> None:
+    """Bake a custom AMI with the server dependencies preinstalled.
+
+    The AMI is created from an instance that has completed a deployment and is
+    registered for the region, so later deployments boot from it and skip the
+    package installation step.
+
+    Warning: EC2 reboots the instance to take a consistent image, so a running
+    server goes offline for a few minutes.
+
+    Requires the ec2:CreateImage, ec2:DescribeImages and ssm:PutParameter
+    permissions. If the registered AMI is later deregistered, deployments fall
+    back to the stock Ubuntu image.
+
+    Example:
+        ac-server-manager build-ami --instance-id i-1234567890abcdef0
+    """
+    from .ec2_manager import EC2Manager
+
+    ec2_manager = EC2Manager(region)
+
+    click.echo(f"Building custom AMI from instance {instance_id}...")
+    click.echo(click.style("⚠ The instance will be rebooted while the image is taken", fg="yellow"))
+    ami_id = ec2_manager.build_custom_ami(instance_id, name)
+
+    if ami_id:
+        click.echo(click.style(f"✓ Custom AMI {ami_id} is ready", fg="green", bold=True))
+        click.echo("New deployments in this region will use it automatically.")
+    else:
+        click.echo(click.style("✗ Failed to build custom AMI", fg="red", bold=True))
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -36,18 +36,31 @@ class Deployer:
         """
         logger.info("Starting AC server deployment")
 
-        # Step 1: Create S3 bucket if needed
+        # Step 1: Get Ubuntu AMI and check the launch would succeed before uploading
+        # the pack, so invalid instance settings fail fast
+        ami_id = self.ec2_manager.get_ubuntu_ami()
+        if not ami_id:
+            logger.error("Failed to get Ubuntu AMI")
+            return None
+
+        if not self.ec2_manager.preflight_launch(
+            ami_id, self.config.instance_type, self.config.key_name
+        ):
+            logger.error("Instance launch preflight failed")
+            return None
+
+        # Step 2: Create S3 bucket if needed
         if not self.s3_manager.create_bucket():
             logger.error("Failed to create S3 bucket")
             return None
 
-        # Step 2: Upload pack to S3
+        # Step 3: Upload pack to S3
         s3_key = self.s3_manager.upload_pack(pack_file_path)
         if not s3_key:
             logger.error("Failed to upload pack to S3")
             return None
 
-        # Step 3: Determine IAM instance profile to use
+        # Step 4: Determine IAM instance profile to use
         iam_profile_to_use = None
         if self.config.iam_instance_profile:
             # User provided an explicit instance profile - use it
@@ -72,7 +85,7 @@ class Deployer:
                 )
                 return None
 
-        # Step 4: Create security group
+        # Step 5: Create security group
         security_group_id = self.ec2_manager.create_security_group(
             self.config.security_group_name, "Security group for Assetto Corsa server"
         )
@@ -80,12 +93,6 @@ class Deployer:
             logger.error("Failed to create security group")
             return None
 
-        # Step 5: Get Ubuntu AMI
-        ami_id = self.ec2_manager.get_ubuntu_ami()
-        if not ami_id:
-            logger.error("Failed to get Ubuntu AMI")
-            return None
-
         # Step 6: Create user data script
         user_data = self.ec2_manager.create_user_data_script(self.config.s3_bucket_name, s3_key)
 
@@ -1,193 +1,162 @@
 """EC2 operations for AC Server Manager."""
 
+import functools
+import gzip
 import logging
-from typing import Optional
+import random
+import string
+import time
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Optional
 
-import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, WaiterError
 
+from .aws import get_client
 from .config import AC_SERVER_HTTP_PORT, AC_SERVER_TCP_PORT, AC_SERVER_UDP_PORT
 
 logger = logging.getLogger(__name__)
 
+# Exponential backoff used when polling for instance state transitions. The delay
+# doubles from the base up to the cap; 24 attempts is roughly a 10 minute ceiling.
+INSTANCE_WAIT_BASE_DELAY = 2.0
+INSTANCE_WAIT_MAX_DELAY = 30.0
+INSTANCE_WAIT_MAX_ATTEMPTS = 24
 
-class EC2Manager:
-    """Manages EC2 operations for AC server deployment."""
+# describe_instances results are reused for this many seconds before being fetched again
+INSTANCE_CACHE_TTL = 15.0
 
-    def __init__(self, region: str = "us-east-1"):
-        """Initialize EC2 manager.
+# Page size for filtered describe_instances scans (the API maximum)
+DESCRIBE_PAGE_SIZE = 1000
 
-        Args:
-            region: AWS region
-        """
-        self.region = region
-        self.ec2_client = boto3.client("ec2", region_name=region)
-        self.ec2_resource = boto3.resource("ec2", region_name=region)
+# Tags applied to every launched instance in addition to its Name tag
+_INSTANCE_TAGS: tuple[tuple[str, str], ...] = (("Application", "ac-server"),)
 
-    def create_security_group(self, group_name: str, description: str) -> Optional[str]:
-        """Create security group with rules for AC server.
+# SSM parameter caching the ID of a custom AMI with the server dependencies baked in
+CUSTOM_AMI_PARAMETER = "/ac-server-manager/ami/{region}"
 
-        Args:
-            group_name: Name of the security group
-            description: Description of the security group
+# Polling budget while a custom AMI is created (up to one hour)
+AMI_WAIT_DELAY = 15
+AMI_WAIT_MAX_ATTEMPTS = 240
 
-        Returns:
-            Security group ID, or None if creation failed
-        """
-        try:
-            # Check if security group already exists
-            response = self.ec2_client.describe_security_groups(
-                Filters=[{"Name": "group-name", "Values": [group_name]}]
-            )
-
-            if response["SecurityGroups"]:
-                group_id = response["SecurityGroups"][0]["GroupId"]
-                logger.info(f"Security group {group_name} already exists: {group_id}")
-                return group_id
+# Ingress rules applied to every AC server security group as
+# (protocol, port, description)
+_BASE_INGRESS: tuple[tuple[str, int, str], ...] = (
+    ("tcp", 22, "SSH"),
+    ("tcp", AC_SERVER_HTTP_PORT, "AC HTTP"),
+    ("tcp", AC_SERVER_TCP_PORT, "AC TCP"),
+    ("udp", AC_SERVER_UDP_PORT, "AC UDP"),
+)
 
-            # Create security group
-            create_response = self.ec2_client.create_security_group(
-                GroupName=group_name, Description=description
-            )
-            group_id = create_response["GroupId"]
-            logger.info(f"Created security group {group_name}: {group_id}")
-
-            # Add ingress rules for AC server
-            self.ec2_client.authorize_security_group_ingress(
-                GroupId=group_id,
-                IpPermissions=[
-                    {
-                        "IpProtocol": "tcp",
-                        "FromPort": 22,
-                        "ToPort": 22,
-                        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "SSH"}],
-                    },
-                    {
-                        "IpProtocol": "tcp",
-                        "FromPort": AC_SERVER_HTTP_PORT,
-                        "ToPort": AC_SERVER_HTTP_PORT,
-                        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "AC HTTP"}],
-                    },
-                    {
-                        "IpProtocol": "tcp",
-                        "FromPort": AC_SERVER_TCP_PORT,
-                        "ToPort": AC_SERVER_TCP_PORT,
-                        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "AC TCP"}],
-                    },
-                    {
-                        "IpProtocol": "udp",
-                        "FromPort": AC_SERVER_UDP_PORT,
-                        "ToPort": AC_SERVER_UDP_PORT,
-                        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "AC UDP"}],
-                    },
-                ],
-            )
-            logger.info(f"Added ingress rules to security group {group_id}")
 
-            return group_id
-        except ClientError as e:
-            logger.error(f"Error creating security group: {e}")
-            return None
+def _ingress_permissions() -> list[dict]:
+    """Build the IpPermissions list for the AC server ingress rules.
 
-    def get_ubuntu_ami(self) -> Optional[str]:
-        """Get the latest Ubuntu 22.04 LTS AMI ID.
+    Returns:
+        List of IpPermissions entries for authorize_security_group_ingress
+    """
+    return [
+        {
+            "IpProtocol": protocol,
+            "FromPort": port,
+            "ToPort": port,
+            "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": description}],
+        }
+        for protocol, port, description in _BASE_INGRESS
+    ]
 
-        Returns:
-            AMI ID, or None if not found
-        """
-        try:
-            # Get latest Ubuntu 22.04 LTS AMI
-            response = self.ec2_client.describe_images(
-                Filters=[
-                    {
-                        "Name": "name",
-                        "Values": ["ubuntu/images/hvm-ssd/ubuntu-jammy-22.04-amd64-server-*"],
-                    },
-                    {"Name": "state", "Values": ["available"]},
-                    {"Name": "architecture", "Values": ["x86_64"]},
-                ],
-                Owners=["099720109477"],  # Canonical
-            )
 
-            if not response["Images"]:
-                logger.error("No Ubuntu AMI found")
-                return None
+class _UserDataTemplate(string.Template):
+    """Template for the bash user-data script.
 
-            # Sort by creation date and get the latest
-            images = sorted(response["Images"], key=lambda x: x["CreationDate"], reverse=True)
-            ami_id: str = images[0]["ImageId"]
-            logger.info(f"Found Ubuntu AMI: {ami_id}")
-            return ami_id
-        except ClientError as e:
-            logger.error(f"Error getting AMI: {e}")
-            return None
+    Uses ``@@`` as the placeholder delimiter so bash's own ``$VAR`` syntax can be
+    written verbatim in the script body.
+    """
 
-    def create_user_data_script(self, s3_bucket: str, s3_key: str) -> str:
-        """Create user data script for instance initialization.
+    delimiter = "@@"
 
-        Args:
-            s3_bucket: S3 bucket containing the pack file
-            s3_key: S3 key of the pack file
 
-        Returns:
-            User data script as string
-        """
-        script = f"""#!/bin/bash
+_USER_DATA_SCRIPT = """#!/bin/bash
 set -euo pipefail
 
 # Configuration
 DEPLOY_LOG="/var/log/acserver-deploy.log"
 STATUS_FILE="/opt/acserver/deploy-status.json"
+DEPS_MARKER="/var/lib/ac-server-manager/deps-installed"
 VALIDATION_TIMEOUT=120
-AC_SERVER_TCP_PORT={AC_SERVER_TCP_PORT}
-AC_SERVER_UDP_PORT={AC_SERVER_UDP_PORT}
-AC_SERVER_HTTP_PORT={AC_SERVER_HTTP_PORT}
+AC_SERVER_TCP_PORT=@@tcp_port
+AC_SERVER_UDP_PORT=@@udp_port
+AC_SERVER_HTTP_PORT=@@http_port
 
 # Logging function - logs to both file and cloud-init output
-log_message() {{
+log_message() {
     echo "[$(date '+%Y-%m-%d %H:%M:%S')] $1" | tee -a "$DEPLOY_LOG"
-}}
+}
 
 # Error tracking
 declare -a ERROR_MESSAGES=()
 
-add_error() {{
+add_error() {
     ERROR_MESSAGES+=("$1")
     log_message "✗ ERROR: $1"
-}}
+}
 
 # Write status JSON
-write_status() {{
+write_status() {
     local success=$1
     local public_ip=$2
     local timestamp=$(date -Iseconds)
     
     cat > "$STATUS_FILE" << STATUSEOF
-{{
+{
   "success": $success,
   "timestamp": "$timestamp",
   "public_ip": "$public_ip",
-  "ports": {{
+  "ports": {
     "tcp": $AC_SERVER_TCP_PORT,
     "udp": $AC_SERVER_UDP_PORT,
     "http": $AC_SERVER_HTTP_PORT
-  }},
+  },
   "error_messages": [
-    $(printf '"%s"' "${{ERROR_MESSAGES[@]}}" | paste -sd, -)
+    $(printf '"%s"' "${ERROR_MESSAGES[@]}" | paste -sd, -)
   ]
-}}
+}
 STATUSEOF
     log_message "Status written to $STATUS_FILE"
-}}
+}
 
 # Main deployment script
 log_message "===== Starting AC Server Deployment ====="
 
+# Fetch the public IP once via IMDSv2 and reuse it for every status report
+IMDS_TOKEN=$(curl -sSf --max-time 5 -X PUT -H "X-aws-ec2-metadata-token-ttl-seconds: 21600" http://169.254.169.254/latest/api/token 2>/dev/null || true)
+PUBLIC_IP=$(curl -sSf --max-time 5 -H "X-aws-ec2-metadata-token: $IMDS_TOKEN" http://169.254.169.254/latest/meta-data/public-ipv4 2>/dev/null || echo "unknown")
+
 # Update system and install required packages
-log_message "Installing required packages..."
-export DEBIAN_FRONTEND=noninteractive
-apt-get update -qq
-apt-get install -y -qq awscli unzip wget tar jq file iproute2 net-tools lib32gcc-s1 lib32stdc++6 2>&1 | tee -a "$DEPLOY_LOG"
+if [ -f "$DEPS_MARKER" ]; then
+    # Custom AMIs built with build-ami already carry every required package
+    log_message "✓ Required packages already installed, skipping apt"
+    # Images baked from a provisioned instance still carry its server files and
+    # may have the old service enabled; start from a clean server directory
+    systemctl stop acserver 2>/dev/null || true
+    rm -rf /opt/acserver
+else
+    log_message "Installing required packages..."
+    export DEBIAN_FRONTEND=noninteractive
+    apt-get update -qq
+    apt-get install -y -qq awscli unzip wget tar jq iproute2 net-tools lib32gcc-s1 lib32stdc++6 2>&1 | tee -a "$DEPLOY_LOG"
+    mkdir -p "$(dirname "$DEPS_MARKER")"
+    touch "$DEPS_MARKER"
+fi
+
+# Pre-warm the root EBS volume in the background. Blocks restored from an AMI
+# snapshot are fetched lazily on first read, which would otherwise slow down
+# the extraction and file scans below.
+ROOT_DEV=$(lsblk -no PKNAME "$(findmnt -n -o SOURCE /)" 2>/dev/null || true)
+if [ -n "$ROOT_DEV" ] && [ -b "/dev/$ROOT_DEV" ]; then
+    log_message "Pre-warming root volume /dev/$ROOT_DEV in the background..."
+    nohup dd if="/dev/$ROOT_DEV" of=/dev/null bs=16M iflag=direct status=none >/dev/null 2>&1 &
+fi
 
 # Create directory for AC server
 log_message "Creating server directory..."
@@ -199,13 +168,12 @@ log_message "Downloading server pack from S3..."
 MAX_RETRIES=3
 RETRY_DELAY=5
 for attempt in $(seq 1 $MAX_RETRIES); do
-    if aws s3 cp s3://{s3_bucket}/{s3_key} ./server-pack.tar.gz 2>&1 | tee -a "$DEPLOY_LOG"; then
+    if aws s3 cp s3://@@s3_bucket/@@s3_key ./server-pack.tar.gz 2>&1 | tee -a "$DEPLOY_LOG"; then
         log_message "✓ Download successful"
         break
     else
         if [ $attempt -eq $MAX_RETRIES ]; then
             add_error "Failed to download pack from S3 after $MAX_RETRIES attempts"
-            PUBLIC_IP=$(curl -s http://169.254.169.254/latest/meta-data/public-ipv4 || echo "unknown")
             write_status false "$PUBLIC_IP"
             exit 1
         fi
@@ -218,7 +186,6 @@ done
 # Verify downloaded file
 if [ ! -f "./server-pack.tar.gz" ] || [ ! -s "./server-pack.tar.gz" ]; then
     add_error "Downloaded file is missing or empty"
-    PUBLIC_IP=$(curl -s http://169.254.169.254/latest/meta-data/public-ipv4 || echo "unknown")
     write_status false "$PUBLIC_IP"
     exit 1
 fi
@@ -229,7 +196,6 @@ if tar -xzf server-pack.tar.gz 2>&1 | tee -a "$DEPLOY_LOG"; then
     log_message "✓ Extraction successful"
 else
     add_error "Failed to extract server pack - file may be corrupted"
-    PUBLIC_IP=$(curl -s http://169.254.169.254/latest/meta-data/public-ipv4 || echo "unknown")
     write_status false "$PUBLIC_IP"
     exit 1
 fi
@@ -265,7 +231,6 @@ fi
 
 if [ -z "$ACSERVER_PATH" ]; then
     add_error "No acServer binary found in extracted pack"
-    PUBLIC_IP=$(curl -s http://169.254.169.254/latest/meta-data/public-ipv4 || echo "unknown")
     write_status false "$PUBLIC_IP"
     exit 1
 fi
@@ -278,19 +243,19 @@ log_message "Absolute path: $ACSERVER_PATH"
 
 # Verify binary is Linux-compatible
 log_message "Verifying binary compatibility..."
-BINARY_TYPE=$(file "$ACSERVER_PATH")
-log_message "Binary type: $BINARY_TYPE"
+# Read the 4-byte magic number directly instead of forking file + grep
+BINARY_MAGIC=$(od -An -tx1 -N4 "$ACSERVER_PATH" 2>/dev/null || true)
+BINARY_MAGIC=${BINARY_MAGIC//[[:space:]]/}
+log_message "Binary magic: $BINARY_MAGIC"
 
-if echo "$BINARY_TYPE" | grep -q "PE32\\|MS Windows"; then
+if [ "${BINARY_MAGIC:0:4}" = "4d5a" ]; then
     add_error "Windows PE binary detected - pack must contain Linux acServer binary or use Wine/Proton"
-    PUBLIC_IP=$(curl -s http://169.254.169.254/latest/meta-data/public-ipv4 || echo "unknown")
     write_status false "$PUBLIC_IP"
     exit 1
 fi
 
-if ! echo "$BINARY_TYPE" | grep -q "ELF"; then
-    add_error "Binary is not a Linux ELF executable: $BINARY_TYPE"
-    PUBLIC_IP=$(curl -s http://169.254.169.254/latest/meta-data/public-ipv4 || echo "unknown")
+if [ "$BINARY_MAGIC" != "7f454c46" ]; then
+    add_error "Binary is not a Linux ELF executable (magic: $BINARY_MAGIC)"
     write_status false "$PUBLIC_IP"
     exit 1
 fi
@@ -340,15 +305,13 @@ systemctl enable acserver
 systemctl start acserver
 
 # Wait for server to start
-log_message "Waiting for server to initialize (timeout: ${{VALIDATION_TIMEOUT}}s)..."
+log_message "Waiting for server to initialize (timeout: ${VALIDATION_TIMEOUT}s)..."
 sleep 10
 
 # Run validation checks
 log_message "===== Starting Post-Boot Validation ====="
 validation_failed=false
 
-# Get public IP
-PUBLIC_IP=$(curl -s http://169.254.169.254/latest/meta-data/public-ipv4 || echo "unknown")
 log_message "Public IP: $PUBLIC_IP"
 
 # Check if process is running
@@ -369,7 +332,7 @@ while [ $elapsed -lt $VALIDATION_TIMEOUT ]; do
 done
 
 if [ "$process_running" = false ]; then
-    add_error "acServer process is not running after ${{VALIDATION_TIMEOUT}}s"
+    add_error "acServer process is not running after ${VALIDATION_TIMEOUT}s"
     validation_failed=true
     log_message "Systemd service status:"
     systemctl status acserver 2>&1 | tee -a "$DEPLOY_LOG" || true
@@ -381,29 +344,23 @@ fi
 log_message "Checking if required ports are listening..."
 sleep 5  # Give server time to bind ports
 
-check_port_listening() {{
+# Snapshot TCP and UDP listening sockets once instead of running ss/netstat per port
+LISTENING_SOCKETS=$(ss -tulnp 2>/dev/null || netstat -tulnp 2>/dev/null || true)
+
+check_port_listening() {
     local proto=$1
     local port=$2
     local port_type=$3
-    
-    if [ "$proto" = "tcp" ]; then
-        if ss -tlnp 2>/dev/null | grep -q ":$port " || netstat -tlnp 2>/dev/null | grep -q ":$port "; then
-            log_message "✓ TCP port $port ($port_type) is listening"
-            return 0
-        else
-            add_error "TCP port $port ($port_type) is not listening"
-            return 1
-        fi
+    local label=${proto^^}
+
+    if grep -q "^$proto.*:$port[[:space:]]" <<< "$LISTENING_SOCKETS"; then
+        log_message "✓ $label port $port ($port_type) is listening"
+        return 0
     else
-        if ss -ulnp 2>/dev/null | grep -q ":$port " || netstat -ulnp 2>/dev/null | grep -q ":$port "; then
-            log_message "✓ UDP port $port ($port_type) is listening"
-            return 0
-        else
-            add_error "UDP port $port ($port_type) is not listening"
-            return 1
-        fi
+        add_error "$label port $port ($port_type) is not listening"
+        return 1
     fi
-}}
+}
 
 if ! check_port_listening tcp $AC_SERVER_TCP_PORT "game"; then
     validation_failed=true
@@ -445,30 +402,39 @@ if [ -n "$LOG_FILES" ]; then
         if [ -f "$log_file" ] && [ -r "$log_file" ]; then
             log_message "Checking log: $log_file"
             
-            # Check for common error patterns
-            if grep -qi "track not found\\|content not found\\|missing track\\|missing car" "$log_file" 2>/dev/null; then
-                add_error "Missing content detected in server logs"
-                grep -i "track not found\\|content not found\\|missing track\\|missing car" "$log_file" 2>/dev/null | tail -3 | while read line; do
-                    log_message "  $line"
-                done
-                validation_failed=true
-            fi
-            
-            if grep -qi "failed to bind\\|port.*in use\\|address already in use" "$log_file" 2>/dev/null; then
-                add_error "Port binding errors detected in server logs"
-                grep -i "failed to bind\\|port.*in use\\|address already in use" "$log_file" 2>/dev/null | tail -3 | while read line; do
-                    log_message "  $line"
-                done
-                validation_failed=true
-            fi
-            
-            if grep -qi "permission denied\\|segmentation fault\\|core dumped" "$log_file" 2>/dev/null; then
-                add_error "Critical errors detected in server logs"
-                grep -i "permission denied\\|segmentation fault\\|core dumped" "$log_file" 2>/dev/null | tail -3 | while read line; do
-                    log_message "  $line"
-                done
-                validation_failed=true
-            fi
+            # Scan each log once for all error categories, keeping the last 3 matches of each
+            LOG_SCAN=$(awk '
+                function keep(category, text) {
+                    hits[category]++
+                    last[category, hits[category] % 3] = text
+                }
+                { lower = tolower($0) }
+                lower ~ /track not found|content not found|missing track|missing car/ { keep(1, $0) }
+                lower ~ /failed to bind|port.*in use|address already in use/ { keep(2, $0) }
+                lower ~ /permission denied|segmentation fault|core dumped/ { keep(3, $0) }
+                END {
+                    title[1] = "Missing content detected in server logs"
+                    title[2] = "Port binding errors detected in server logs"
+                    title[3] = "Critical errors detected in server logs"
+                    for (c = 1; c <= 3; c++) {
+                        if (!hits[c]) continue
+                        print "ERROR\t" title[c]
+                        first = hits[c] > 3 ? hits[c] - 2 : 1
+                        for (i = first; i <= hits[c]; i++) print "MATCH\t" last[c, i % 3]
+                    }
+                }' "$log_file" 2>/dev/null || true)
+
+            while IFS=$'\t' read -r kind text; do
+                case "$kind" in
+                    ERROR)
+                        add_error "$text"
+                        validation_failed=true
+                        ;;
+                    MATCH)
+                        log_message "  $text"
+                        ;;
+                esac
+            done <<< "$LOG_SCAN"
         fi
     done
 else
@@ -496,7 +462,259 @@ else
     exit 0
 fi
 """
-        return script
+
+# The port constants never change at runtime, so they are bound once at import time
+# and only the per-deploy S3 location is substituted in create_user_data_script.
+_USER_DATA_TEMPLATE = _UserDataTemplate(
+    _UserDataTemplate(_USER_DATA_SCRIPT).safe_substitute(
+        tcp_port=AC_SERVER_TCP_PORT,
+        udp_port=AC_SERVER_UDP_PORT,
+        http_port=AC_SERVER_HTTP_PORT,
+    )
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_user_data(s3_bucket: str, s3_key: str) -> str:
+    """Render the user data script for an S3 pack location.
+
+    Repeated deployments of the same pack reuse the rendered script.
+    """
+    return _USER_DATA_TEMPLATE.substitute(s3_bucket=s3_bucket, s3_key=s3_key)
+
+
+@functools.lru_cache(maxsize=32)
+def _compress_user_data(user_data: str) -> bytes:
+    """Gzip a user data script for run_instances.
+
+    cloud-init detects and decompresses gzipped user data itself, so the script
+    runs unchanged while staying well under the 16KB user data limit.
+    """
+    return gzip.compress(user_data.encode("utf-8"), mtime=0)
+
+
+class EC2Manager:
+    """Manages EC2 operations for AC server deployment."""
+
+    def __init__(self, region: str = "us-east-1"):
+        """Initialize EC2 manager.
+
+        Args:
+            region: AWS region
+        """
+        self.region = region
+        self.ec2_client = get_client("ec2", region)
+        self.ssm_client = get_client("ssm", region)
+        self._instance_cache: dict[str, tuple[float, dict]] = {}
+
+    def create_security_group(self, group_name: str, description: str) -> Optional[str]:
+        """Create security group with rules for AC server.
+
+        Args:
+            group_name: Name of the security group
+            description: Description of the security group
+
+        Returns:
+            Security group ID, or None if creation failed
+        """
+        try:
+            # Check if security group already exists
+            response = self.ec2_client.describe_security_groups(
+                Filters=[{"Name": "group-name", "Values": [group_name]}]
+            )
+
+            if response["SecurityGroups"]:
+                group_id = response["SecurityGroups"][0]["GroupId"]
+                logger.info(f"Security group {group_name} already exists: {group_id}")
+                return group_id
+
+            # Create security group
+            create_response = self.ec2_client.create_security_group(
+                GroupName=group_name, Description=description
+            )
+            group_id = create_response["GroupId"]
+            logger.info(f"Created security group {group_name}: {group_id}")
+
+            # Add ingress rules for AC server
+            self.ec2_client.authorize_security_group_ingress(
+                GroupId=group_id, IpPermissions=_ingress_permissions()
+            )
+            logger.info(f"Added ingress rules to security group {group_id}")
+
+            return group_id
+        except ClientError as e:
+            logger.error(f"Error creating security group: {e}")
+            return None
+
+    def get_ubuntu_ami(self) -> Optional[str]:
+        """Get the latest Ubuntu 22.04 LTS AMI ID.
+
+        Prefers a custom AMI registered with build_custom_ami, falling back to the
+        latest Canonical image.
+
+        Returns:
+            AMI ID, or None if not found
+        """
+        custom_ami = self.get_custom_ami()
+        if custom_ami:
+            logger.info(f"Using custom AMI: {custom_ami}")
+            return custom_ami
+
+        try:
+            # Get latest Ubuntu 22.04 LTS AMI
+            response = self.ec2_client.describe_images(
+                Filters=[
+                    {
+                        "Name": "name",
+                        "Values": ["ubuntu/images/hvm-ssd/ubuntu-jammy-22.04-amd64-server-*"],
+                    },
+                    {"Name": "state", "Values": ["available"]},
+                    {"Name": "architecture", "Values": ["x86_64"]},
+                ],
+                Owners=["099720109477"],  # Canonical
+            )
+
+            if not response["Images"]:
+                logger.error("No Ubuntu AMI found")
+                return None
+
+            # Pick the most recently created image
+            latest_image = max(response["Images"], key=itemgetter("CreationDate"))
+            ami_id: str = latest_image["ImageId"]
+            logger.info(f"Found Ubuntu AMI: {ami_id}")
+            return ami_id
+        except ClientError as e:
+            logger.error(f"Error getting AMI: {e}")
+            return None
+
+    def get_custom_ami(self) -> Optional[str]:
+        """Get the custom AMI ID registered for this region.
+
+        A registered AMI that has since been deregistered, or is not available, is
+        ignored so deployments fall back to the stock Ubuntu image.
+
+        Returns:
+            AMI ID stored in the SSM parameter, or None if none is registered or
+            the registered AMI is not available
+        """
+        parameter_name = CUSTOM_AMI_PARAMETER.format(region=self.region)
+        try:
+            response = self.ssm_client.get_parameter(Name=parameter_name)
+            ami_id: str = response["Parameter"]["Value"]
+        except ClientError as e:
+            logger.debug(f"No custom AMI registered in {parameter_name}: {e}")
+            return None
+
+        try:
+            images = self.ec2_client.describe_images(ImageIds=[ami_id])["Images"]
+        except ClientError as e:
+            logger.warning(f"Custom AMI {ami_id} from {parameter_name} not found: {e}")
+            return None
+
+        if not images or images[0].get("State") != "available":
+            logger.warning(f"Custom AMI {ami_id} from {parameter_name} is not available")
+            return None
+
+        return ami_id
+
+    def build_custom_ami(self, instance_id: str, name: Optional[str] = None) -> Optional[str]:
+        """Create an AMI from a provisioned instance and register it for future deploys.
+
+        The instance should have completed its first deployment so that all required
+        packages are installed. New deployments then skip the apt install stage.
+
+        Args:
+            instance_id: ID of the provisioned instance to image
+            name: AMI name (defaults to a timestamped name)
+
+        Returns:
+            AMI ID, or None if creation failed
+        """
+        if name is None:
+            name = f"ac-server-base-{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}"
+
+        try:
+            response = self.ec2_client.create_image(
+                InstanceId=instance_id,
+                Name=name,
+                Description="AC server base image with dependencies preinstalled",
+            )
+            ami_id: str = response["ImageId"]
+            logger.info(f"Creating AMI {ami_id} from instance {instance_id}...")
+
+            waiter = self.ec2_client.get_waiter("image_available")
+            waiter.wait(
+                ImageIds=[ami_id],
+                WaiterConfig={"Delay": AMI_WAIT_DELAY, "MaxAttempts": AMI_WAIT_MAX_ATTEMPTS},
+            )
+            logger.info(f"AMI {ami_id} is available")
+
+            parameter_name = CUSTOM_AMI_PARAMETER.format(region=self.region)
+            self.ssm_client.put_parameter(
+                Name=parameter_name,
+                Value=ami_id,
+                Type="String",
+                DataType="aws:ec2:image",
+                Overwrite=True,
+            )
+            logger.info(f"Registered AMI {ami_id} in {parameter_name}")
+
+            return ami_id
+        except ClientError as e:
+            logger.error(f"Error building custom AMI: {e}")
+            return None
+        except WaiterError as e:
+            logger.error(f"AMI from instance {instance_id} did not become available: {e}")
+            return None
+
+    def create_user_data_script(self, s3_bucket: str, s3_key: str) -> str:
+        """Create user data script for instance initialization.
+
+        Args:
+            s3_bucket: S3 bucket containing the pack file
+            s3_key: S3 key of the pack file
+
+        Returns:
+            User data script as string
+        """
+        return _render_user_data(s3_bucket, s3_key)
+
+    def preflight_launch(
+        self, ami_id: str, instance_type: str, key_name: Optional[str] = None
+    ) -> bool:
+        """Check that an instance could be launched, without launching it.
+
+        Issues run_instances with DryRun=True, which validates the AMI, instance
+        type, key pair and permissions without provisioning anything.
+
+        Args:
+            ami_id: AMI ID to use
+            instance_type: EC2 instance type
+            key_name: SSH key pair name (optional)
+
+        Returns:
+            True if the launch would succeed, False otherwise
+        """
+        launch_params = {
+            "ImageId": ami_id,
+            "InstanceType": instance_type,
+            "MinCount": 1,
+            "MaxCount": 1,
+            "DryRun": True,
+        }
+        if key_name:
+            launch_params["KeyName"] = key_name
+
+        try:
+            self.ec2_client.run_instances(**launch_params)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "DryRunOperation":
+                return True
+            logger.error(f"Launch preflight failed: {e}")
+            return False
+
+        # DryRun requests never succeed outright; treat an unexpected success as valid
+        return True
 
     def launch_instance(
         self,
@@ -523,21 +741,19 @@ fi
             Instance ID, or None if launch failed
         """
         try:
-            from typing import Any, Dict
-
-            launch_params: Dict[str, Any] = {
+            launch_params: dict[str, Any] = {
                 "ImageId": ami_id,
                 "InstanceType": instance_type,
                 "SecurityGroupIds": [security_group_id],
-                "UserData": user_data,
+                "UserData": _compress_user_data(user_data),
                 "MinCount": 1,
                 "MaxCount": 1,
                 "TagSpecifications": [
                     {
                         "ResourceType": "instance",
                         "Tags": [
-                            {"Key": "Name", "Value": instance_name},
-                            {"Key": "Application", "Value": "ac-server"},
+                            {"Key": key, "Value": value}
+                            for key, value in (("Name", instance_name), *_INSTANCE_TAGS)
                         ],
                     }
                 ],
@@ -559,8 +775,11 @@ fi
             logger.info(f"Launched instance {instance_id}")
 
             # Wait for instance to be running
-            waiter = self.ec2_client.get_waiter("instance_running")
-            waiter.wait(InstanceIds=[instance_id])
+            if not self._wait_for_instance_state(
+                instance_id, "running", failure_states=("shutting-down", "terminated", "stopping")
+            ):
+                logger.error(f"Instance {instance_id} did not reach the running state")
+                return None
             logger.info(f"Instance {instance_id} is running")
 
             return instance_id
@@ -578,11 +797,10 @@ fi
             Public IP address, or None if not found
         """
         try:
-            response = self.ec2_client.describe_instances(InstanceIds=[instance_id])
-            if not response["Reservations"]:
+            instance = self._describe_instance(instance_id)
+            if instance is None:
                 return None
 
-            instance = response["Reservations"][0]["Instances"][0]
             return instance.get("PublicIpAddress")
         except ClientError as e:
             logger.error(f"Error getting instance IP: {e}")
@@ -599,6 +817,7 @@ fi
         """
         try:
             self.ec2_client.stop_instances(InstanceIds=[instance_id])
+            self._invalidate_instance(instance_id)
             logger.info(f"Stopped instance {instance_id}")
             return True
         except ClientError as e:
@@ -616,6 +835,7 @@ fi
         """
         try:
             self.ec2_client.start_instances(InstanceIds=[instance_id])
+            self._invalidate_instance(instance_id)
             logger.info(f"Started instance {instance_id}")
             return True
         except ClientError as e:
@@ -633,6 +853,7 @@ fi
         """
         try:
             self.ec2_client.terminate_instances(InstanceIds=[instance_id])
+            self._invalidate_instance(instance_id)
             logger.info(f"Terminated instance {instance_id}")
             return True
         except ClientError as e:
@@ -649,44 +870,36 @@ fi
         Returns:
             True if termination succeeded, False otherwise
         """
+        if dry_run:
+            logger.info(f"[DRY RUN] Would terminate instance: {instance_id}")
+            return True
+
         try:
-            # Check if instance exists
+            # terminate_instances is idempotent for terminated instances, so no
+            # existence check is needed first
+            logger.info(f"Terminating instance {instance_id}...")
             try:
-                response = self.ec2_client.describe_instances(InstanceIds=[instance_id])
-                if not response["Reservations"]:
-                    logger.warning(f"Instance {instance_id} not found")
-                    return True  # Already gone
-
-                instance_state = response["Reservations"][0]["Instances"][0]["State"]["Name"]
-                if instance_state == "terminated":
-                    logger.info(f"Instance {instance_id} is already terminated")
-                    return True
-
+                response = self.ec2_client.terminate_instances(InstanceIds=[instance_id])
             except ClientError as e:
                 if e.response["Error"]["Code"] == "InvalidInstanceID.NotFound":
                     logger.info(f"Instance {instance_id} not found, already terminated")
                     return True
                 raise
+            finally:
+                self._invalidate_instance(instance_id)
 
-            if dry_run:
-                logger.info(f"[DRY RUN] Would terminate instance: {instance_id}")
+            if response["TerminatingInstances"][0]["CurrentState"]["Name"] == "terminated":
+                logger.info(f"Instance {instance_id} is already terminated")
                 return True
-
-            # Terminate the instance
-            logger.info(f"Terminating instance {instance_id}...")
-            self.ec2_client.terminate_instances(InstanceIds=[instance_id])
             logger.info(f"Termination initiated for instance {instance_id}")
 
             # Wait for instance to terminate
             logger.info(f"Waiting for instance {instance_id} to terminate...")
-            waiter = self.ec2_client.get_waiter("instance_terminated")
-            waiter.wait(
-                InstanceIds=[instance_id],
-                WaiterConfig={
-                    "Delay": 15,  # Check every 15 seconds
-                    "MaxAttempts": 40,  # Wait up to 10 minutes
-                },
-            )
+            if not self._wait_for_instance_state(
+                instance_id, "terminated", failure_states=("pending", "stopping"), status_only=True
+            ):
+                logger.error(f"Instance {instance_id} did not reach the terminated state")
+                return False
             logger.info(f"Instance {instance_id} has been terminated")
             return True
 
@@ -694,6 +907,119 @@ fi
             logger.error(f"Error terminating instance {instance_id}: {e}")
             return False
 
+    def _describe_instance(self, instance_id: str, refresh: bool = False) -> Optional[dict]:
+        """Describe a single instance, reusing a recent response when available.
+
+        Args:
+            instance_id: Instance ID
+            refresh: If True, always call describe_instances and refresh the cache
+
+        Returns:
+            Instance description, or None if not found
+
+        Raises:
+            ClientError: If the describe_instances call fails
+        """
+        if not refresh:
+            cached = self._instance_cache.get(instance_id)
+            if cached and time.monotonic() - cached[0] < INSTANCE_CACHE_TTL:
+                return cached[1]
+
+        response = self.ec2_client.describe_instances(InstanceIds=[instance_id])
+        if not response["Reservations"]:
+            self._invalidate_instance(instance_id)
+            return None
+
+        instance: dict = response["Reservations"][0]["Instances"][0]
+        self._instance_cache[instance_id] = (time.monotonic(), instance)
+        return instance
+
+    def _invalidate_instance(self, instance_id: str) -> None:
+        """Drop any cached description of an instance.
+
+        Args:
+            instance_id: Instance ID
+        """
+        self._instance_cache.pop(instance_id, None)
+
+    def _wait_for_instance_state(
+        self,
+        instance_id: str,
+        target_state: str,
+        failure_states: tuple[str, ...] = (),
+        status_only: bool = False,
+    ) -> bool:
+        """Poll an instance until it reaches a target state.
+
+        Polls with exponential backoff and jitter, so fast transitions are noticed
+        quickly while long waits issue few API calls.
+
+        Args:
+            instance_id: Instance ID
+            target_state: Instance state name to wait for
+            failure_states: States that mean the target will never be reached
+            status_only: If True, poll DescribeInstanceStatus, whose responses are much
+                smaller, instead of refreshing the cached instance description. Use
+                when the caller needs nothing but the state afterwards.
+
+        Returns:
+            True if the instance reached the target state (an instance that no longer
+                exists counts as terminated), False on failure or timeout
+        """
+        for attempt in range(INSTANCE_WAIT_MAX_ATTEMPTS):
+            try:
+                if status_only:
+                    state = self._get_instance_state(instance_id)
+                else:
+                    instance = self._describe_instance(instance_id, refresh=True)
+                    state = instance["State"]["Name"] if instance else None
+            except ClientError as e:
+                # Newly launched instances may not be visible to describe calls yet
+                if e.response["Error"]["Code"] != "InvalidInstanceID.NotFound":
+                    raise
+                state = None
+
+            if state == target_state:
+                return True
+            if state is None and target_state == "terminated":
+                # Terminated instances drop out of describe results after a while
+                logger.info(f"Instance {instance_id} no longer exists, treating as terminated")
+                return True
+            if state in failure_states:
+                logger.error(f"Instance {instance_id} entered state {state}")
+                return False
+            if attempt == INSTANCE_WAIT_MAX_ATTEMPTS - 1:
+                break
+
+            delay = min(INSTANCE_WAIT_MAX_DELAY, INSTANCE_WAIT_BASE_DELAY * 2**attempt)
+            logger.debug(f"Instance {instance_id} is {state}, checking again in {delay:.0f}s")
+            time.sleep(delay + random.uniform(0, delay * 0.1))
+
+        logger.error(f"Timed out waiting for instance {instance_id} to be {target_state}")
+        return False
+
+    def _get_instance_state(self, instance_id: str) -> Optional[str]:
+        """Get the current state name of an instance.
+
+        Args:
+            instance_id: Instance ID
+
+        Returns:
+            Instance state name, or None if the instance was not found
+
+        Raises:
+            ClientError: If the describe_instance_status call fails
+        """
+        response = self.ec2_client.describe_instance_status(
+            InstanceIds=[instance_id], IncludeAllInstances=True
+        )
+        statuses = response["InstanceStatuses"]
+        if not statuses:
+            return None
+
+        state: str = statuses[0]["InstanceState"]["Name"]
+        return state
+
     def find_instances_by_name(self, instance_name: str) -> list[str]:
         """Find instances by name tag.
 
@@ -703,43 +1029,48 @@ fi
         Returns:
             List of instance IDs
         """
+        # An empty name would drop the tag filter's selectivity and scan the whole account
+        if not instance_name:
+            return []
+
         try:
-            response = self.ec2_client.describe_instances(
+            paginator = self.ec2_client.get_paginator("describe_instances")
+            pages = paginator.paginate(
                 Filters=[
                     {"Name": "tag:Name", "Values": [instance_name]},
                     {
                         "Name": "instance-state-name",
                         "Values": ["pending", "running", "stopping", "stopped"],
                     },
-                ]
+                ],
+                PaginationConfig={"PageSize": DESCRIBE_PAGE_SIZE},
             )
 
-            instance_ids = []
-            for reservation in response["Reservations"]:
-                for instance in reservation["Instances"]:
-                    instance_ids.append(instance["InstanceId"])
-
-            return instance_ids
+            reservations = chain.from_iterable(page["Reservations"] for page in pages)
+            return [
+                instance["InstanceId"]
+                for reservation in reservations
+                for instance in reservation["Instances"]
+            ]
         except ClientError as e:
             logger.error(f"Error finding instances: {e}")
             return []
 
-    def get_instance_details(self, instance_id: str) -> Optional[dict]:
+    def get_instance_details(self, instance_id: str, refresh: bool = False) -> Optional[dict]:
         """Get detailed information about an instance.
 
         Args:
             instance_id: Instance ID
+            refresh: If True, bypass the cached describe_instances response
 
         Returns:
             Dictionary with instance details, or None if not found
         """
         try:
-            response = self.ec2_client.describe_instances(InstanceIds=[instance_id])
-            if not response["Reservations"]:
+            instance = self._describe_instance(instance_id, refresh=refresh)
+            if instance is None:
                 return None
 
-            instance = response["Reservations"][0]["Instances"][0]
-
             # Extract relevant information
             details = {
                 "instance_id": instance["InstanceId"],
@@ -751,10 +1082,11 @@ fi
             }
 
             # Extract name tag
-            for tag in instance.get("Tags", []):
-                if tag["Key"] == "Name":
-                    details["name"] = tag["Value"]
-                    break
+            name = next(
+                (tag["Value"] for tag in instance.get("Tags", ()) if tag["Key"] == "Name"), None
+            )
+            if name is not None:
+                details["name"] = name
 
             return details
         except ClientError as e:
@@ -2,10 +2,13 @@
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-import boto3
 from botocore.exceptions import ClientError
 
+from .aws import get_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +22,7 @@ class IAMManager:
             region: AWS region (IAM is global but region is kept for consistency)
         """
         self.region = region
-        self.iam_client = boto3.client("iam", region_name=region)
+        self.iam_client = get_client("iam", region)
 
     def ensure_role_and_instance_profile(
         self, role_name: str, instance_profile_name: str, bucket: str
@@ -44,19 +47,25 @@ class IAMManager:
         logger.info(f"Ensuring IAM role '{role_name}' and profile '{instance_profile_name}'")
 
         try:
-            # Step 1: Create or get IAM role
-            role_arn = self._ensure_role(role_name)
-            logger.debug(f"Role ARN: {role_arn}")
-
-            # Step 2: Create or get instance profile
-            profile_arn = self._ensure_instance_profile(instance_profile_name)
-            logger.debug(f"Instance profile ARN: {profile_arn}")
-
-            # Step 3: Attach role to instance profile
-            self._attach_role_to_profile(instance_profile_name, role_name)
-
-            # Step 4: Attach inline policy for S3 access
-            self._attach_s3_policy(role_name, bucket)
+            # IAM calls are latency-bound, so independent steps run concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Steps 1 and 2: Create or get IAM role and instance profile
+                role_future = executor.submit(self._ensure_role, role_name)
+                profile_future = executor.submit(
+                    self._ensure_instance_profile, instance_profile_name
+                )
+                role_arn = role_future.result()
+                logger.debug(f"Role ARN: {role_arn}")
+                profile_arn = profile_future.result()
+                logger.debug(f"Instance profile ARN: {profile_arn}")
+
+                # Steps 3 and 4: Attach role to instance profile and S3 policy to role
+                attach_future = executor.submit(
+                    self._attach_role_to_profile, instance_profile_name, role_name
+                )
+                policy_future = executor.submit(self._attach_s3_policy, role_name, bucket)
+                attach_future.result()
+                policy_future.result()
 
             logger.info(f"Successfully configured IAM role and profile for S3 bucket '{bucket}'")
             return instance_profile_name
@@ -191,6 +200,10 @@ class IAMManager:
             ],
         }
 
+        if self._get_role_policy(role_name, policy_name) == policy_document:
+            logger.debug(f"Inline policy '{policy_name}' on role '{role_name}' is up to date")
+            return
+
         try:
             logger.info(f"Attaching S3 access policy to role '{role_name}' for bucket '{bucket}'")
             self.iam_client.put_role_policy(
@@ -202,3 +215,24 @@ class IAMManager:
         except ClientError as e:
             logger.error(f"Failed to attach S3 policy: {e}")
             raise
+
+    def _get_role_policy(self, role_name: str, policy_name: str) -> Optional[dict]:
+        """Get an inline role policy document.
+
+        Args:
+            role_name: Name of the IAM role
+            policy_name: Name of the inline policy
+
+        Returns:
+            Parsed policy document, or None if it does not exist or cannot be read
+        """
+        try:
+            response = self.iam_client.get_role_policy(RoleName=role_name, PolicyName=policy_name)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchEntity":
+                logger.debug(f"Could not read inline policy '{policy_name}': {e}")
+            return None
+
+        # botocore URL-decodes and parses the policy document
+        document: Optional[dict] = response.get("PolicyDocument")
+        return document
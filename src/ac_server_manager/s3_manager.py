@@ -1,14 +1,52 @@
 """S3 operations for AC Server Manager."""
 
+import hashlib
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
-import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
+from .aws import get_client
+
 logger = logging.getLogger(__name__)
 
+# Object metadata key holding the SHA-256 of an uploaded pack
+PACK_DIGEST_METADATA_KEY = "sha256"
+
+# Number of delete_objects batches (up to 1000 keys each) issued concurrently
+DELETE_MAX_WORKERS = 16
+
+
+def _preferred_transfer_client() -> str:
+    """Return the transfer client to request from boto3.
+
+    Returns:
+        "crt" when the optional awscrt package (the ``crt`` extra) is installed,
+        otherwise "auto"
+    """
+    try:
+        import awscrt  # type: ignore[import-not-found]  # noqa: F401
+    except ImportError:
+        return "auto"
+    return "crt"
+
+
+# Pack transfers use large parts and more threads than the boto3 defaults
+# (8MB parts, 10 threads); packs are commonly over 1GB. With the crt extra
+# installed, boto3 hands transfers to the CRT client, which ignores the
+# part and thread settings and sizes its own.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=20,
+    io_chunksize=1024 * 1024,
+    use_threads=True,
+    preferred_transfer_client=_preferred_transfer_client(),
+)
+
 
 class S3Manager:
     """Manages S3 operations for AC server pack files."""
@@ -22,44 +60,59 @@ class S3Manager:
         """
         self.bucket_name = bucket_name
         self.region = region
-        self.s3_client = boto3.client("s3", region_name=region)
+        self.s3_client = get_client("s3", region)
 
     def create_bucket(self) -> bool:
         """Create S3 bucket if it doesn't exist.
 
+        Outside us-east-1 creation is attempted directly and an already-owned
+        bucket counts as success, which saves a head_bucket round trip on every
+        deploy. us-east-1 answers CreateBucket on an owned bucket with a 200 and
+        resets its ACL, so there the bucket is checked first.
+
         Returns:
             True if bucket was created or already exists, False otherwise
         """
+        if self.region == "us-east-1":
+            try:
+                self.s3_client.head_bucket(Bucket=self.bucket_name)
+                logger.info(f"Bucket {self.bucket_name} already exists")
+                return True
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in ("404", "NoSuchBucket"):
+                    logger.error(f"Error checking bucket: {e}")
+                    return False
+
         try:
-            # Check if bucket exists
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
-            logger.info(f"Bucket {self.bucket_name} already exists")
+            if self.region == "us-east-1":
+                self.s3_client.create_bucket(Bucket=self.bucket_name)
+            else:
+                from typing import cast, Any
+
+                self.s3_client.create_bucket(
+                    Bucket=self.bucket_name,
+                    CreateBucketConfiguration={"LocationConstraint": cast(Any, self.region)},
+                )
+            logger.info(f"Created bucket {self.bucket_name}")
             return True
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
-            if error_code == "404":
-                # Bucket doesn't exist, create it
-                try:
-                    if self.region == "us-east-1":
-                        self.s3_client.create_bucket(Bucket=self.bucket_name)
-                    else:
-                        from typing import cast, Any
-
-                        self.s3_client.create_bucket(
-                            Bucket=self.bucket_name,
-                            CreateBucketConfiguration={
-                                "LocationConstraint": cast(Any, self.region)
-                            },
-                        )
-                    logger.info(f"Created bucket {self.bucket_name}")
-                    return True
-                except ClientError as create_error:
-                    logger.error(f"Error creating bucket: {create_error}")
-                    return False
-            else:
-                logger.error(f"Error checking bucket: {e}")
+            if error_code == "BucketAlreadyOwnedByYou":
+                logger.info(f"Bucket {self.bucket_name} already exists")
+                return True
+            if error_code != "AccessDenied":
+                logger.error(f"Error creating bucket: {e}")
                 return False
 
+        # Without s3:CreateBucket, the bucket may still exist and be usable
+        try:
+            self.s3_client.head_bucket(Bucket=self.bucket_name)
+            logger.info(f"Bucket {self.bucket_name} already exists")
+            return True
+        except ClientError as e:
+            logger.error(f"Error checking bucket: {e}")
+            return False
+
     def upload_pack(self, local_path: Path, s3_key: Optional[str] = None) -> Optional[str]:
         """Upload AC server pack to S3.
 
@@ -78,16 +131,51 @@ class S3Manager:
             s3_key = f"packs/{local_path.name}"
 
         try:
-            self.s3_client.upload_file(str(local_path), self.bucket_name, s3_key)
+            digest = _file_sha256(local_path)
+            if self._get_pack_digest(s3_key) == digest:
+                logger.info(
+                    f"Pack s3://{self.bucket_name}/{s3_key} is already up to date, skipping upload"
+                )
+                return s3_key
+
+            self.s3_client.upload_file(
+                str(local_path),
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={"Metadata": {PACK_DIGEST_METADATA_KEY: digest}},
+                Config=TRANSFER_CONFIG,
+            )
             logger.info(f"Uploaded {local_path} to s3://{self.bucket_name}/{s3_key}")
             return s3_key
         except ClientError as e:
             logger.error(f"Error uploading pack: {e}")
             return None
 
+    def _get_pack_digest(self, s3_key: str) -> Optional[str]:
+        """Get the SHA-256 recorded on an uploaded pack.
+
+        Args:
+            s3_key: S3 object key
+
+        Returns:
+            Hex digest stored in the object metadata, or None if the object does not
+            exist or was uploaded without one
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError as e:
+            logger.debug(f"No existing pack at s3://{self.bucket_name}/{s3_key}: {e}")
+            return None
+
+        digest: Optional[str] = response.get("Metadata", {}).get(PACK_DIGEST_METADATA_KEY)
+        return digest
+
     def download_pack(self, s3_key: str, local_path: Path) -> bool:
         """Download AC server pack from S3.
 
+        An existing local file matching the SHA-256 recorded on the uploaded pack is
+        kept as-is and the download is skipped.
+
         Args:
             s3_key: S3 object key
             local_path: Local path to save the file
@@ -99,7 +187,13 @@ class S3Manager:
             # Create parent directory if it doesn't exist
             local_path.parent.mkdir(parents=True, exist_ok=True)
 
-            self.s3_client.download_file(self.bucket_name, s3_key, str(local_path))
+            if local_path.exists() and self._get_pack_digest(s3_key) == _file_sha256(local_path):
+                logger.info(f"{local_path} is already up to date, skipping download")
+                return True
+
+            self.s3_client.download_file(
+                self.bucket_name, s3_key, str(local_path), Config=TRANSFER_CONFIG
+            )
             logger.info(f"Downloaded s3://{self.bucket_name}/{s3_key} to {local_path}")
             return True
         except ClientError as e:
@@ -113,12 +207,13 @@ class S3Manager:
             List of S3 keys for pack files
         """
         try:
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket_name, Prefix="packs/")
-
-            if "Contents" not in response:
-                return []
-
-            return [obj["Key"] for obj in response["Contents"]]
+            # list_objects_v2 returns at most 1000 keys per call
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            return [
+                obj["Key"]
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix="packs/")
+                for obj in page.get("Contents", [])
+            ]
         except ClientError as e:
             logger.error(f"Error listing packs: {e}")
             return []
@@ -153,29 +248,22 @@ class S3Manager:
             True if deletion succeeded (or would succeed in dry-run), False otherwise
         """
         try:
-            # Check if bucket exists
+            # Check if bucket has versioning enabled; this also tells us whether the
+            # bucket exists, so no separate head_bucket call is needed
             try:
-                self.s3_client.head_bucket(Bucket=self.bucket_name)
+                versioning = self.s3_client.get_bucket_versioning(Bucket=self.bucket_name)
+                is_versioned = versioning.get("Status") == "Enabled"
+                logger.debug(f"Bucket versioning status: {versioning.get('Status', 'Not enabled')}")
             except ClientError as e:
-                error_code = e.response["Error"]["Code"]
-                if error_code == "404":
+                if e.response["Error"]["Code"] == "NoSuchBucket":
                     logger.info(f"Bucket {self.bucket_name} does not exist, nothing to delete")
                     return True
-                else:
-                    raise
+                is_versioned = False
 
             logger.info(
                 f"{'[DRY RUN] Would delete' if dry_run else 'Deleting'} bucket {self.bucket_name} and all contents"
             )
 
-            # Check if bucket has versioning enabled
-            try:
-                versioning = self.s3_client.get_bucket_versioning(Bucket=self.bucket_name)
-                is_versioned = versioning.get("Status") == "Enabled"
-                logger.debug(f"Bucket versioning status: {versioning.get('Status', 'Not enabled')}")
-            except ClientError:
-                is_versioned = False
-
             # Delete all object versions and delete markers if versioned
             if is_versioned:
                 logger.info("Bucket has versioning enabled, deleting all versions...")
@@ -210,32 +298,33 @@ class S3Manager:
             True if deletion succeeded, False otherwise
         """
         try:
-            # Use pagination to handle large buckets
+            # Use pagination to handle large buckets; each page is deleted in the
+            # background while the next one is listed
             paginator = self.s3_client.get_paginator("list_objects_v2")
             total_objects = 0
+            deletions: list[Future[int]] = []
+
+            with ThreadPoolExecutor(max_workers=DELETE_MAX_WORKERS) as executor:
+                for page in paginator.paginate(Bucket=self.bucket_name):
+                    if "Contents" not in page:
+                        continue
+
+                    objects_to_delete = [{"Key": obj["Key"]} for obj in page["Contents"]]
+                    total_objects += len(objects_to_delete)
+
+                    if dry_run:
+                        logger.debug(
+                            f"[DRY RUN] Would delete {len(objects_to_delete)} objects from page"
+                        )
+                        for obj in objects_to_delete[:5]:  # Show first 5
+                            logger.debug(f"[DRY RUN] Would delete: {obj['Key']}")
+                        if len(objects_to_delete) > 5:
+                            logger.debug(f"[DRY RUN] ... and {len(objects_to_delete) - 5} more")
+                    else:
+                        deletions.append(executor.submit(self._delete_batch, objects_to_delete))
 
-            for page in paginator.paginate(Bucket=self.bucket_name):
-                if "Contents" not in page:
-                    continue
-
-                objects_to_delete = [{"Key": obj["Key"]} for obj in page["Contents"]]
-                total_objects += len(objects_to_delete)
-
-                if dry_run:
-                    logger.debug(
-                        f"[DRY RUN] Would delete {len(objects_to_delete)} objects from page"
-                    )
-                    for obj in objects_to_delete[:5]:  # Show first 5
-                        logger.debug(f"[DRY RUN] Would delete: {obj['Key']}")
-                    if len(objects_to_delete) > 5:
-                        logger.debug(f"[DRY RUN] ... and {len(objects_to_delete) - 5} more")
-                else:
-                    # Use bulk delete for efficiency
-                    response = self.s3_client.delete_objects(
-                        Bucket=self.bucket_name, Delete={"Objects": objects_to_delete}
-                    )
-                    deleted_count = len(response.get("Deleted", []))
-                    logger.debug(f"Deleted {deleted_count} objects from page")
+                for deletion in deletions:
+                    logger.debug(f"Deleted {deletion.result()} objects from page")
 
             if dry_run:
                 logger.info(f"[DRY RUN] Would delete {total_objects} total objects")
@@ -258,47 +347,48 @@ class S3Manager:
             True if deletion succeeded, False otherwise
         """
         try:
-            # Use pagination to handle large buckets
+            # Use pagination to handle large buckets; each page is deleted in the
+            # background while the next one is listed
             paginator = self.s3_client.get_paginator("list_object_versions")
             total_versions = 0
+            deletions: list[Future[int]] = []
 
-            for page in paginator.paginate(Bucket=self.bucket_name):
-                objects_to_delete = []
+            with ThreadPoolExecutor(max_workers=DELETE_MAX_WORKERS) as executor:
+                for page in paginator.paginate(Bucket=self.bucket_name):
+                    objects_to_delete = []
 
-                # Add all versions
-                for version in page.get("Versions", []):
-                    objects_to_delete.append(
-                        {"Key": version["Key"], "VersionId": version["VersionId"]}
-                    )
+                    # Add all versions
+                    for version in page.get("Versions", []):
+                        objects_to_delete.append(
+                            {"Key": version["Key"], "VersionId": version["VersionId"]}
+                        )
 
-                # Add all delete markers
-                for marker in page.get("DeleteMarkers", []):
-                    objects_to_delete.append(
-                        {"Key": marker["Key"], "VersionId": marker["VersionId"]}
-                    )
+                    # Add all delete markers
+                    for marker in page.get("DeleteMarkers", []):
+                        objects_to_delete.append(
+                            {"Key": marker["Key"], "VersionId": marker["VersionId"]}
+                        )
 
-                if not objects_to_delete:
-                    continue
+                    if not objects_to_delete:
+                        continue
 
-                total_versions += len(objects_to_delete)
+                    total_versions += len(objects_to_delete)
 
-                if dry_run:
-                    logger.debug(
-                        f"[DRY RUN] Would delete {len(objects_to_delete)} versions/markers from page"
-                    )
-                    for obj in objects_to_delete[:5]:  # Show first 5
+                    if dry_run:
                         logger.debug(
-                            f"[DRY RUN] Would delete: {obj['Key']} (version {obj['VersionId']})"
+                            f"[DRY RUN] Would delete {len(objects_to_delete)} versions/markers from page"
                         )
-                    if len(objects_to_delete) > 5:
-                        logger.debug(f"[DRY RUN] ... and {len(objects_to_delete) - 5} more")
-                else:
-                    # Use bulk delete for efficiency
-                    response = self.s3_client.delete_objects(
-                        Bucket=self.bucket_name, Delete={"Objects": objects_to_delete}
-                    )
-                    deleted_count = len(response.get("Deleted", []))
-                    logger.debug(f"Deleted {deleted_count} versions/markers from page")
+                        for obj in objects_to_delete[:5]:  # Show first 5
+                            logger.debug(
+                                f"[DRY RUN] Would delete: {obj['Key']} (version {obj['VersionId']})"
+                            )
+                        if len(objects_to_delete) > 5:
+                            logger.debug(f"[DRY RUN] ... and {len(objects_to_delete) - 5} more")
+                    else:
+                        deletions.append(executor.submit(self._delete_batch, objects_to_delete))
+
+                for deletion in deletions:
+                    logger.debug(f"Deleted {deletion.result()} versions/markers from page")
 
             if dry_run:
                 logger.info(f"[DRY RUN] Would delete {total_versions} total versions/markers")
@@ -310,3 +400,37 @@ class S3Manager:
         except ClientError as e:
             logger.error(f"Error deleting versioned objects: {e}")
             return False
+
+    def _delete_batch(self, objects_to_delete: list[dict]) -> int:
+        """Bulk delete one batch of up to 1000 objects or versions.
+
+        Args:
+            objects_to_delete: Delete entries with a Key and optional VersionId
+
+        Returns:
+            Number of objects reported as deleted
+
+        Raises:
+            ClientError: If the delete_objects call fails
+        """
+        response = self.s3_client.delete_objects(
+            Bucket=self.bucket_name, Delete={"Objects": objects_to_delete}
+        )
+        return len(response.get("Deleted", []))
+
+
+def _file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 hex digest of a file.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes to read at a time
+
+    Returns:
+        Hex digest of the file contents
+    """
+    sha256 = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
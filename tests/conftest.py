@@ -0,0 +1,41 @@
+"""Shared pytest fixtures."""
+
+import socket
+from typing import Any, Iterator
+from unittest.mock import MagicMock
+
+import boto3
+import pytest
+
+from ac_server_manager.aws import get_client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_boto3_client() -> Iterator[None]:
+    """Make boto3.client return a fresh MagicMock for every client the code builds."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(boto3, "client", lambda *args, **kwargs: MagicMock())
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_client_cache() -> Iterator[None]:
+    """Ensure each test builds fresh (and possibly patched) boto3 clients."""
+    get_client.cache_clear()
+    yield
+    get_client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def disable_network(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail fast if a test opens a real socket, e.g. through an unmocked boto3 call.
+
+    Tests that need a local socket can opt out with ``@pytest.mark.enable_socket``.
+    """
+    if request.node.get_closest_marker("enable_socket"):
+        return
+
+    def guard(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("Network access is disabled in tests")
+
+    monkeypatch.setattr(socket, "socket", guard)
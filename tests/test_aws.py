@@ -0,0 +1,26 @@
+"""Unit tests for shared AWS client construction."""
+
+from unittest.mock import patch
+
+from ac_server_manager.aws import CLIENT_CONFIG, get_client
+
+
+def test_get_client_reuses_client_per_service_and_region() -> None:
+    """Test clients are created once per service and region."""
+    with patch("boto3.client") as mock_client:
+        first = get_client("ec2", "us-east-1")
+        second = get_client("ec2", "us-east-1")
+        get_client("ec2", "eu-west-1")
+        get_client("s3", "us-east-1")
+
+    assert first is second
+    assert mock_client.call_count == 3
+    mock_client.assert_any_call("ec2", region_name="us-east-1", config=CLIENT_CONFIG)
+    mock_client.assert_any_call("ec2", region_name="eu-west-1", config=CLIENT_CONFIG)
+    mock_client.assert_any_call("s3", region_name="us-east-1", config=CLIENT_CONFIG)
+
+
+def test_client_config_uses_adaptive_retries() -> None:
+    """Test shared clients use adaptive retries and a larger connection pool."""
+    assert CLIENT_CONFIG.retries == {"mode": "adaptive", "max_attempts": 10}
+    assert CLIENT_CONFIG.max_pool_connections == 32
@@ -1,313 +1,256 @@
 """Unit tests for CLI commands."""
 
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock
+
 import pytest
 from click.testing import CliRunner
 
-from ac_server_manager.cli import status, terminate_all
+from ac_server_manager import cli, ec2_manager, s3_manager
+from ac_server_manager.cli import build_ami, status, terminate_all
 from ac_server_manager.config import AC_SERVER_HTTP_PORT, AC_SERVER_TCP_PORT
 
+# Deployer.get_status results for a running and a stopped instance
+RUNNING_DETAILS = {
+    "instance_id": "i-12345",
+    "state": "running",
+    "instance_type": "t3.small",
+    "public_ip": "1.2.3.4",
+    "private_ip": "10.0.0.1",
+    "launch_time": datetime(2024, 1, 1),
+    "name": "test-instance",
+}
+STOPPED_DETAILS = {**RUNNING_DETAILS, "state": "stopped", "public_ip": None}
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def runner() -> CliRunner:
-    """Create CLI test runner."""
+    """Create CLI test runner.
+
+    CliRunner isolates each invoke, so one runner is shared by the module.
+    """
     return CliRunner()
 
 
-def test_status_command_displays_acstuff_url(runner: CliRunner) -> None:
-    """Test that status command displays correct acstuff.ru join link format."""
-    mock_details = {
-        "instance_id": "i-12345",
-        "state": "running",
-        "instance_type": "t3.small",
-        "public_ip": "1.2.3.4",
-        "private_ip": "10.0.0.1",
-        "launch_time": datetime(2024, 1, 1),
-        "name": "test-instance",
-    }
-
-    with (
-        patch("ac_server_manager.cli.Deployer") as MockDeployer,
-        patch("ac_server_manager.cli.check_host_reachable") as mock_ping,
-        patch("ac_server_manager.cli.check_tcp_port") as mock_tcp,
-        patch("ac_server_manager.cli.check_udp_port") as mock_udp,
-        patch("ac_server_manager.cli.check_url_accessible") as mock_url,
-    ):
-
-        mock_deployer_instance = MagicMock()
-        mock_deployer_instance.get_status.return_value = mock_details
-        MockDeployer.return_value = mock_deployer_instance
-
-        # Mock connectivity checks to pass
-        mock_ping.return_value = True
-        mock_tcp.return_value = True
-        mock_udp.return_value = True
-        mock_url.return_value = (True, None)
-
-        result = runner.invoke(status)
-
-        assert result.exit_code == 0
-        # Check that the new acstuff.ru URL format is displayed with & separators
-        expected_url = f"https://acstuff.ru/s/q:race/online/join?ip=1.2.3.4&httpPort={AC_SERVER_HTTP_PORT}&password="
-        assert expected_url in result.output
-        assert "acstuff.ru link:" in result.output
-        # Ensure old format with colon is not present
-        assert f"1.2.3.4:{AC_SERVER_TCP_PORT}" not in result.output.split("acstuff.ru link:")[1]
-
-
-def test_status_command_displays_connection_info(runner: CliRunner) -> None:
-    """Test that status command displays all connection information."""
-    mock_details = {
-        "instance_id": "i-12345",
-        "state": "running",
-        "instance_type": "t3.small",
-        "public_ip": "1.2.3.4",
-        "private_ip": "10.0.0.1",
-        "launch_time": datetime(2024, 1, 1),
-        "name": "test-instance",
-    }
-
-    with (
-        patch("ac_server_manager.cli.Deployer") as MockDeployer,
-        patch("ac_server_manager.cli.check_host_reachable") as mock_ping,
-        patch("ac_server_manager.cli.check_tcp_port") as mock_tcp,
-        patch("ac_server_manager.cli.check_udp_port") as mock_udp,
-        patch("ac_server_manager.cli.check_url_accessible") as mock_url,
-    ):
-
-        mock_deployer_instance = MagicMock()
-        mock_deployer_instance.get_status.return_value = mock_details
-        MockDeployer.return_value = mock_deployer_instance
-
-        # Mock connectivity checks to pass
-        mock_ping.return_value = True
-        mock_tcp.return_value = True
-        mock_udp.return_value = True
-        mock_url.return_value = (True, None)
-
-        result = runner.invoke(status)
-
-        assert result.exit_code == 0
-        assert "Instance ID: i-12345" in result.output
-        assert "State:" in result.output
-        assert "running" in result.output
-        assert "Public IP: 1.2.3.4" in result.output
-        assert f"Direct Connect: 1.2.3.4:{AC_SERVER_TCP_PORT}" in result.output
-        assert "Join Server:" in result.output
-        assert "Connectivity Checks:" in result.output
-
-
-def test_status_command_no_instance_found(runner: CliRunner) -> None:
+@pytest.fixture
+def cli_mocks(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the managers and connectivity checks used by CLI commands with mocks.
+
+    Connectivity checks pass by default. Plain Mock is enough since the CLI never
+    uses magic methods on these objects.
+    """
+    mocks = SimpleNamespace(
+        deployer=Mock(),
+        ec2=Mock(),
+        s3=Mock(),
+        S3Manager=Mock(),
+        ping=Mock(return_value=True),
+        tcp=Mock(return_value=True),
+        udp=Mock(return_value=True),
+        url=Mock(return_value=(True, None)),
+    )
+    mocks.S3Manager.return_value = mocks.s3
+
+    monkeypatch.setattr(cli, "Deployer", Mock(return_value=mocks.deployer))
+    monkeypatch.setattr(cli, "check_host_reachable", mocks.ping)
+    monkeypatch.setattr(cli, "check_tcp_port", mocks.tcp)
+    monkeypatch.setattr(cli, "check_udp_port", mocks.udp)
+    monkeypatch.setattr(cli, "check_url_accessible", mocks.url)
+    # terminate-all and build-ami import the managers from their modules when they run
+    monkeypatch.setattr(ec2_manager, "EC2Manager", Mock(return_value=mocks.ec2))
+    monkeypatch.setattr(s3_manager, "S3Manager", mocks.S3Manager)
+    return mocks
+
+
+@pytest.mark.parametrize(
+    "expected_lines",
+    [
+        pytest.param(
+            [
+                # New acstuff.ru URL format with & separators
+                (
+                    "https://acstuff.ru/s/q:race/online/join"
+                    f"?ip=1.2.3.4&httpPort={AC_SERVER_HTTP_PORT}&password="
+                ),
+                "acstuff.ru link:",
+            ],
+            id="acstuff_url",
+        ),
+        pytest.param(
+            [
+                "Instance ID: i-12345",
+                "State:",
+                "running",
+                "Public IP: 1.2.3.4",
+                f"Direct Connect: 1.2.3.4:{AC_SERVER_TCP_PORT}",
+                "Join Server:",
+                "Connectivity Checks:",
+            ],
+            id="connection_info",
+        ),
+    ],
+)
+def test_status_command_running_instance(
+    runner: CliRunner, cli_mocks: SimpleNamespace, expected_lines: list[str]
+) -> None:
+    """Test that status command displays join and connection info for a running instance."""
+    cli_mocks.deployer.get_status.return_value = RUNNING_DETAILS
+
+    result = runner.invoke(status)
+
+    assert result.exit_code == 0
+    for line in expected_lines:
+        assert line in result.output
+    # Ensure old format with colon is not present in the join link
+    assert f"1.2.3.4:{AC_SERVER_TCP_PORT}" not in result.output.split("acstuff.ru link:")[1]
+
+
+def test_status_command_no_instance_found(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
     """Test status command when no instance is found."""
-    with patch("ac_server_manager.cli.Deployer") as MockDeployer:
-        mock_deployer_instance = MagicMock()
-        mock_deployer_instance.get_status.return_value = None
-        MockDeployer.return_value = mock_deployer_instance
+    cli_mocks.deployer.get_status.return_value = None
 
-        result = runner.invoke(status)
+    result = runner.invoke(status)
 
-        assert result.exit_code == 1
-        assert "No instance found" in result.output
+    assert result.exit_code == 1
+    assert "No instance found" in result.output
 
 
-def test_status_command_instance_not_running(runner: CliRunner) -> None:
+def test_status_command_instance_not_running(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
     """Test status command when instance is not in running state."""
-    mock_details = {
-        "instance_id": "i-12345",
-        "state": "stopped",
-        "instance_type": "t3.small",
-        "public_ip": None,
-        "private_ip": "10.0.0.1",
-        "launch_time": datetime(2024, 1, 1),
-        "name": "test-instance",
-    }
-
-    with patch("ac_server_manager.cli.Deployer") as MockDeployer:
-        mock_deployer_instance = MagicMock()
-        mock_deployer_instance.get_status.return_value = mock_details
-        MockDeployer.return_value = mock_deployer_instance
-
-        result = runner.invoke(status)
-
-        assert result.exit_code == 0
-        assert "Instance is stopped" in result.output
-        # Should not display acstuff.ru link for stopped instance
-        assert "acstuff.ru" not in result.output
-
-
-def test_status_command_connectivity_checks_failing(runner: CliRunner) -> None:
+    cli_mocks.deployer.get_status.return_value = STOPPED_DETAILS
+
+    result = runner.invoke(status)
+
+    assert result.exit_code == 0
+    assert "Instance is stopped" in result.output
+    # Should not display acstuff.ru link for stopped instance
+    assert "acstuff.ru" not in result.output
+
+
+def test_status_command_connectivity_checks_failing(
+    runner: CliRunner, cli_mocks: SimpleNamespace
+) -> None:
     """Test that status command displays connectivity check failures."""
-    mock_details = {
-        "instance_id": "i-12345",
-        "state": "running",
-        "instance_type": "t3.small",
-        "public_ip": "1.2.3.4",
-        "private_ip": "10.0.0.1",
-        "launch_time": datetime(2024, 1, 1),
-        "name": "test-instance",
-    }
-
-    with (
-        patch("ac_server_manager.cli.Deployer") as MockDeployer,
-        patch("ac_server_manager.cli.check_host_reachable") as mock_ping,
-        patch("ac_server_manager.cli.check_tcp_port") as mock_tcp,
-        patch("ac_server_manager.cli.check_udp_port") as mock_udp,
-        patch("ac_server_manager.cli.check_url_accessible") as mock_url,
-    ):
-
-        mock_deployer_instance = MagicMock()
-        mock_deployer_instance.get_status.return_value = mock_details
-        MockDeployer.return_value = mock_deployer_instance
-
-        # Mock connectivity checks to fail
-        mock_ping.return_value = False
-        mock_tcp.return_value = False
-        mock_udp.return_value = False
-        mock_url.return_value = (False, "HTTP 404")
-
-        result = runner.invoke(status)
-
-        assert result.exit_code == 0
-        assert "Connectivity Checks:" in result.output
-        assert "is not reachable" in result.output
-        assert "is not accessible" in result.output
-        assert "failed" in result.output or "not accessible" in result.output
-
-
-def test_terminate_all_dry_run(runner: CliRunner) -> None:
-    """Test terminate-all command in dry-run mode."""
-    with (
-        patch("ac_server_manager.ec2_manager.EC2Manager") as MockEC2Manager,
-        patch("ac_server_manager.s3_manager.S3Manager") as MockS3Manager,
-    ):
-        mock_ec2 = MagicMock()
-        mock_ec2.find_instances_by_name.return_value = ["i-12345"]
-        mock_ec2.terminate_instance_and_wait.return_value = True
-        MockEC2Manager.return_value = mock_ec2
+    cli_mocks.deployer.get_status.return_value = RUNNING_DETAILS
 
-        mock_s3 = MagicMock()
-        mock_s3.delete_bucket_recursive.return_value = True
-        MockS3Manager.return_value = mock_s3
+    # Mock connectivity checks to fail
+    cli_mocks.ping.return_value = False
+    cli_mocks.tcp.return_value = False
+    cli_mocks.udp.return_value = False
+    cli_mocks.url.return_value = (False, "HTTP 404")
 
-        result = runner.invoke(terminate_all, ["--dry-run"])
+    result = runner.invoke(status)
 
-        assert result.exit_code == 0
-        assert "[DRY RUN]" in result.output
-        assert "No resources were actually deleted" in result.output
-        mock_ec2.terminate_instance_and_wait.assert_called_once_with("i-12345", dry_run=True)
-        mock_s3.delete_bucket_recursive.assert_called_once_with(dry_run=True)
+    assert result.exit_code == 0
+    assert "Connectivity Checks:" in result.output
+    assert "is not reachable" in result.output
+    assert "is not accessible" in result.output
+    assert "failed" in result.output or "not accessible" in result.output
 
 
-def test_terminate_all_force(runner: CliRunner) -> None:
-    """Test terminate-all command with force flag."""
-    with (
-        patch("ac_server_manager.ec2_manager.EC2Manager") as MockEC2Manager,
-        patch("ac_server_manager.s3_manager.S3Manager") as MockS3Manager,
-    ):
-        mock_ec2 = MagicMock()
-        mock_ec2.find_instances_by_name.return_value = ["i-12345"]
-        mock_ec2.terminate_instance_and_wait.return_value = True
-        MockEC2Manager.return_value = mock_ec2
+def test_terminate_all_dry_run(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
+    """Test terminate-all command in dry-run mode."""
+    cli_mocks.ec2.find_instances_by_name.return_value = ["i-12345"]
+    cli_mocks.ec2.terminate_instance_and_wait.return_value = True
+    cli_mocks.s3.delete_bucket_recursive.return_value = True
 
-        mock_s3 = MagicMock()
-        mock_s3.delete_bucket_recursive.return_value = True
-        MockS3Manager.return_value = mock_s3
+    result = runner.invoke(terminate_all, ["--dry-run"])
 
-        result = runner.invoke(terminate_all, ["--force"])
+    assert result.exit_code == 0
+    assert "[DRY RUN]" in result.output
+    assert "No resources were actually deleted" in result.output
+    cli_mocks.ec2.terminate_instance_and_wait.assert_called_once_with("i-12345", dry_run=True)
+    cli_mocks.s3.delete_bucket_recursive.assert_called_once_with(dry_run=True)
 
-        assert result.exit_code == 0
-        assert "Teardown completed successfully" in result.output
-        # Should not have prompted for confirmation
-        assert "Type" not in result.output or "TERMINATE" not in result.output.split("Teardown")[0]
 
+def test_terminate_all_force(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
+    """Test terminate-all command with force flag."""
+    cli_mocks.ec2.find_instances_by_name.return_value = ["i-12345"]
+    cli_mocks.ec2.terminate_instance_and_wait.return_value = True
+    cli_mocks.s3.delete_bucket_recursive.return_value = True
+
+    result = runner.invoke(terminate_all, ["--force"])
+
+    assert result.exit_code == 0
+    assert "Teardown completed successfully" in result.output
+    # Should not have prompted for confirmation
+    assert "Type" not in result.output or "TERMINATE" not in result.output.split("Teardown")[0]
 
-def test_terminate_all_skip_bucket(runner: CliRunner) -> None:
-    """Test terminate-all command with skip-bucket flag."""
-    with (
-        patch("ac_server_manager.ec2_manager.EC2Manager") as MockEC2Manager,
-        patch("ac_server_manager.s3_manager.S3Manager") as MockS3Manager,
-    ):
-        mock_ec2 = MagicMock()
-        mock_ec2.find_instances_by_name.return_value = ["i-12345"]
-        mock_ec2.terminate_instance_and_wait.return_value = True
-        MockEC2Manager.return_value = mock_ec2
 
-        mock_s3 = MagicMock()
-        MockS3Manager.return_value = mock_s3
+def test_terminate_all_skip_bucket(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
+    """Test terminate-all command with skip-bucket flag."""
+    cli_mocks.ec2.find_instances_by_name.return_value = ["i-12345"]
+    cli_mocks.ec2.terminate_instance_and_wait.return_value = True
 
-        result = runner.invoke(terminate_all, ["--force", "--skip-bucket"])
+    result = runner.invoke(terminate_all, ["--force", "--skip-bucket"])
 
-        assert result.exit_code == 0
-        assert "Teardown completed successfully" in result.output
-        # S3 manager should not have been called to delete bucket
-        mock_s3.delete_bucket_recursive.assert_not_called()
+    assert result.exit_code == 0
+    assert "Teardown completed successfully" in result.output
+    # S3 manager should not have been called to delete bucket
+    cli_mocks.s3.delete_bucket_recursive.assert_not_called()
 
 
-def test_terminate_all_with_explicit_ids(runner: CliRunner) -> None:
+def test_terminate_all_with_explicit_ids(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
     """Test terminate-all command with explicit instance and bucket."""
-    with (
-        patch("ac_server_manager.ec2_manager.EC2Manager") as MockEC2Manager,
-        patch("ac_server_manager.s3_manager.S3Manager") as MockS3Manager,
-    ):
-        mock_ec2 = MagicMock()
-        mock_ec2.terminate_instance_and_wait.return_value = True
-        MockEC2Manager.return_value = mock_ec2
-
-        mock_s3 = MagicMock()
-        mock_s3.delete_bucket_recursive.return_value = True
-        MockS3Manager.return_value = mock_s3
-
-        result = runner.invoke(
-            terminate_all,
-            ["--force", "--instance-id", "i-explicit", "--s3-bucket", "my-explicit-bucket"],
-        )
-
-        assert result.exit_code == 0
-        mock_ec2.terminate_instance_and_wait.assert_called_once_with("i-explicit", dry_run=False)
-        # Check that S3Manager was created with the explicit bucket name
-        MockS3Manager.assert_called_with("my-explicit-bucket", "us-east-1")
-
-
-def test_terminate_all_no_resources_found(runner: CliRunner) -> None:
-    """Test terminate-all command when no resources are found."""
-    with (
-        patch("ac_server_manager.ec2_manager.EC2Manager") as MockEC2Manager,
-        patch("ac_server_manager.s3_manager.S3Manager") as MockS3Manager,
-    ):
-        mock_ec2 = MagicMock()
-        mock_ec2.find_instances_by_name.return_value = []
-        MockEC2Manager.return_value = mock_ec2
+    cli_mocks.ec2.terminate_instance_and_wait.return_value = True
+    cli_mocks.s3.delete_bucket_recursive.return_value = True
+
+    result = runner.invoke(
+        terminate_all,
+        ["--force", "--instance-id", "i-explicit", "--s3-bucket", "my-explicit-bucket"],
+    )
+
+    assert result.exit_code == 0
+    cli_mocks.ec2.terminate_instance_and_wait.assert_called_once_with("i-explicit", dry_run=False)
+    # Check that S3Manager was created with the explicit bucket name
+    cli_mocks.S3Manager.assert_called_with("my-explicit-bucket", "us-east-1")
 
-        mock_s3 = MagicMock()
-        mock_s3.delete_bucket_recursive.return_value = True
-        MockS3Manager.return_value = mock_s3
 
-        result = runner.invoke(terminate_all, ["--force"])
+def test_terminate_all_no_resources_found(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
+    """Test terminate-all command when no resources are found."""
+    cli_mocks.ec2.find_instances_by_name.return_value = []
+    cli_mocks.s3.delete_bucket_recursive.return_value = True
+
+    result = runner.invoke(terminate_all, ["--force"])
 
-        assert result.exit_code == 0
-        assert "No EC2 instance to terminate" in result.output
-        assert "Teardown completed successfully" in result.output
+    assert result.exit_code == 0
+    assert "No EC2 instance to terminate" in result.output
+    assert "Teardown completed successfully" in result.output
 
 
-def test_terminate_all_confirmation_required(runner: CliRunner) -> None:
+def test_terminate_all_confirmation_required(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
     """Test terminate-all command requires confirmation without force."""
-    with (
-        patch("ac_server_manager.ec2_manager.EC2Manager") as MockEC2Manager,
-        patch("ac_server_manager.s3_manager.S3Manager") as MockS3Manager,
-    ):
-        mock_ec2 = MagicMock()
-        mock_ec2.find_instances_by_name.return_value = ["i-12345"]
-        mock_ec2.terminate_instance_and_wait.return_value = True
-        MockEC2Manager.return_value = mock_ec2
-
-        mock_s3 = MagicMock()
-        MockS3Manager.return_value = mock_s3
-
-        # Simulate user entering wrong confirmation
-        result = runner.invoke(terminate_all, input="WRONG\n")
-
-        assert result.exit_code == 1
-        assert "Confirmation failed" in result.output
-        # Should not have called any AWS operations
-        mock_ec2.terminate_instance_and_wait.assert_not_called()
+    cli_mocks.ec2.find_instances_by_name.return_value = ["i-12345"]
+    cli_mocks.ec2.terminate_instance_and_wait.return_value = True
+
+    # Simulate user entering wrong confirmation
+    result = runner.invoke(terminate_all, input="WRONG\n")
+
+    assert result.exit_code == 1
+    assert "Confirmation failed" in result.output
+    # Should not have called any AWS operations
+    cli_mocks.ec2.terminate_instance_and_wait.assert_not_called()
+
+
+def test_build_ami_command_success(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
+    """Test build-ami reports the new AMI and warns about the reboot."""
+    cli_mocks.ec2.build_custom_ami.return_value = "ami-custom"
+
+    result = runner.invoke(build_ami, ["--instance-id", "i-12345", "--name", "test-image"])
+
+    assert result.exit_code == 0
+    assert "rebooted" in result.output
+    assert "Custom AMI ami-custom is ready" in result.output
+    cli_mocks.ec2.build_custom_ami.assert_called_once_with("i-12345", "test-image")
+
+
+def test_build_ami_command_failure(runner: CliRunner, cli_mocks: SimpleNamespace) -> None:
+    """Test build-ami exits non-zero when the AMI cannot be built."""
+    cli_mocks.ec2.build_custom_ami.return_value = None
+
+    result = runner.invoke(build_ami, ["--instance-id", "i-12345"])
+
+    assert result.exit_code == 1
+    assert "Failed to build custom AMI" in result.output
+    cli_mocks.ec2.build_custom_ami.assert_called_once_with("i-12345", None)
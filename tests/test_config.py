@@ -1,5 +1,7 @@
 """Unit tests for config module."""
 
+import pytest
+
 from ac_server_manager.config import (
     ServerConfig,
     AC_SERVER_HTTP_PORT,
@@ -8,23 +10,33 @@ from ac_server_manager.config import (
 )
 
 
-def test_server_config_defaults() -> None:
-    """Test ServerConfig default values."""
-    config = ServerConfig()
+@pytest.fixture(scope="module")
+def default_config() -> ServerConfig:
+    """Create a ServerConfig with all default values."""
+    return ServerConfig()
+
 
-    assert config.aws_region == "us-east-1"
-    assert config.instance_type == "t3.small"
-    assert config.key_name is None
-    assert config.security_group_name == "ac-server-sg"
-    assert config.s3_bucket_name == "ac-server-packs"
-    assert config.pack_file_key is None
-    assert config.auto_create_iam is False
-    assert config.iam_role_name is None
-    assert config.iam_instance_profile_name is None
-    assert config.iam_instance_profile is None
-    assert config.server_name == "AC Server"
-    assert config.max_players == 8
-    assert config.instance_name == "ac-server-instance"
+@pytest.mark.parametrize(
+    "attr, expected",
+    [
+        ("aws_region", "us-east-1"),
+        ("instance_type", "t3.small"),
+        ("key_name", None),
+        ("security_group_name", "ac-server-sg"),
+        ("s3_bucket_name", "ac-server-packs"),
+        ("pack_file_key", None),
+        ("auto_create_iam", False),
+        ("iam_role_name", None),
+        ("iam_instance_profile_name", None),
+        ("iam_instance_profile", None),
+        ("server_name", "AC Server"),
+        ("max_players", 8),
+        ("instance_name", "ac-server-instance"),
+    ],
+)
+def test_server_config_default(default_config: ServerConfig, attr: str, expected: object) -> None:
+    """Test ServerConfig default values."""
+    assert getattr(default_config, attr) == expected
 
 
 def test_server_config_custom_values() -> None:
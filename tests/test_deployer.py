@@ -1,12 +1,34 @@
 """Unit tests for Deployer."""
 
+from datetime import datetime
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, call
 import pytest
 
 from ac_server_manager.config import ServerConfig
 from ac_server_manager.deployer import Deployer
 
+# EC2Manager.get_instance_details result for a running instance
+INSTANCE_DETAILS = {
+    "instance_id": "i-12345",
+    "state": "running",
+    "instance_type": "t3.small",
+    "public_ip": "1.2.3.4",
+    "private_ip": "10.0.0.1",
+    "launch_time": datetime(2024, 1, 1),
+    "name": "test-instance",
+}
+
+# Server pack path; Deployer hands it to the mocked S3Manager and never opens it
+PACK_FILE = Path("test-pack.tar.gz")
+
+# Deployer lifecycle actions and the EC2Manager method each one delegates to
+INSTANCE_ACTIONS = [
+    ("stop", "stop_instance"),
+    ("start", "start_instance"),
+    ("terminate", "terminate_instance"),
+]
+
 
 @pytest.fixture
 def config() -> ServerConfig:
@@ -20,13 +42,11 @@ def config() -> ServerConfig:
 
 
 @pytest.fixture
-def deployer(config: ServerConfig) -> Deployer:
+def deployer(config: ServerConfig, monkeypatch: pytest.MonkeyPatch) -> Deployer:
     """Create Deployer instance for testing."""
-    with (
-        patch("ac_server_manager.deployer.S3Manager"),
-        patch("ac_server_manager.deployer.EC2Manager"),
-    ):
-        return Deployer(config)
+    monkeypatch.setattr("ac_server_manager.deployer.S3Manager", Mock())
+    monkeypatch.setattr("ac_server_manager.deployer.EC2Manager", Mock())
+    return Deployer(config)
 
 
 def test_deployer_init(deployer: Deployer, config: ServerConfig) -> None:
@@ -34,202 +54,141 @@ def test_deployer_init(deployer: Deployer, config: ServerConfig) -> None:
     assert deployer.config == config
 
 
-def test_deploy_success(deployer: Deployer, tmp_path: Path) -> None:
-    """Test successful deployment."""
-    pack_file = tmp_path / "test-pack.tar.gz"
-    pack_file.write_text("test content")
-
-    # Mock all the required methods
-    deployer.s3_manager.create_bucket = MagicMock(return_value=True)
-    deployer.s3_manager.upload_pack = MagicMock(return_value="packs/test-pack.tar.gz")
-    deployer.ec2_manager.create_security_group = MagicMock(return_value="sg-12345")
-    deployer.ec2_manager.get_ubuntu_ami = MagicMock(return_value="ami-12345")
-    deployer.ec2_manager.create_user_data_script = MagicMock(return_value="#!/bin/bash")
-    deployer.ec2_manager.launch_instance = MagicMock(return_value="i-12345")
-    deployer.ec2_manager.get_instance_public_ip = MagicMock(return_value="1.2.3.4")
-
-    result = deployer.deploy(pack_file)
-
-    assert result == "i-12345"
-    deployer.s3_manager.create_bucket.assert_called_once()
-    deployer.s3_manager.upload_pack.assert_called_once_with(pack_file)
-    deployer.ec2_manager.create_security_group.assert_called_once()
-    deployer.ec2_manager.get_ubuntu_ami.assert_called_once()
-    deployer.ec2_manager.launch_instance.assert_called_once()
-
-
-def test_deploy_bucket_creation_fails(deployer: Deployer, tmp_path: Path) -> None:
-    """Test deployment when bucket creation fails."""
-    pack_file = tmp_path / "test-pack.tar.gz"
-    pack_file.write_text("test content")
-
-    deployer.s3_manager.create_bucket = MagicMock(return_value=False)
-
-    result = deployer.deploy(pack_file)
-
-    assert result is None
-
-
-def test_deploy_upload_fails(deployer: Deployer, tmp_path: Path) -> None:
-    """Test deployment when pack upload fails."""
-    pack_file = tmp_path / "test-pack.tar.gz"
-    pack_file.write_text("test content")
-
-    deployer.s3_manager.create_bucket = MagicMock(return_value=True)
-    deployer.s3_manager.upload_pack = MagicMock(return_value=None)
-
-    result = deployer.deploy(pack_file)
-
-    assert result is None
-
-
-def test_deploy_security_group_fails(deployer: Deployer, tmp_path: Path) -> None:
-    """Test deployment when security group creation fails."""
-    pack_file = tmp_path / "test-pack.tar.gz"
-    pack_file.write_text("test content")
-
-    deployer.s3_manager.create_bucket = MagicMock(return_value=True)
-    deployer.s3_manager.upload_pack = MagicMock(return_value="packs/test-pack.tar.gz")
-    deployer.ec2_manager.create_security_group = MagicMock(return_value=None)
-
-    result = deployer.deploy(pack_file)
-
-    assert result is None
+def _mock_successful_deploy(deployer: Deployer) -> None:
+    """Mock every manager call made by deploy to succeed."""
+    deployer.s3_manager.configure_mock(
+        **{
+            "create_bucket.return_value": True,
+            "upload_pack.return_value": "packs/test-pack.tar.gz",
+        }
+    )
+    deployer.ec2_manager.configure_mock(
+        **{
+            "create_security_group.return_value": "sg-12345",
+            "get_ubuntu_ami.return_value": "ami-12345",
+            "preflight_launch.return_value": True,
+            "create_user_data_script.return_value": "#!/bin/bash",
+            "launch_instance.return_value": "i-12345",
+            "get_instance_public_ip.return_value": "1.2.3.4",
+        }
+    )
 
 
-def test_deploy_ami_not_found(deployer: Deployer, tmp_path: Path) -> None:
-    """Test deployment when AMI is not found."""
-    pack_file = tmp_path / "test-pack.tar.gz"
-    pack_file.write_text("test content")
+def test_deploy_success(deployer: Deployer) -> None:
+    """Test successful deployment."""
+    _mock_successful_deploy(deployer)
 
-    deployer.s3_manager.create_bucket = MagicMock(return_value=True)
-    deployer.s3_manager.upload_pack = MagicMock(return_value="packs/test-pack.tar.gz")
-    deployer.ec2_manager.create_security_group = MagicMock(return_value="sg-12345")
-    deployer.ec2_manager.get_ubuntu_ami = MagicMock(return_value=None)
+    result = deployer.deploy(PACK_FILE)
 
-    result = deployer.deploy(pack_file)
+    assert result == "i-12345"
+    assert deployer.s3_manager.mock_calls == [
+        call.create_bucket(),
+        call.upload_pack(PACK_FILE),
+    ]
+    assert deployer.ec2_manager.mock_calls == [
+        call.get_ubuntu_ami(),
+        call.preflight_launch("ami-12345", "t3.small", None),
+        call.create_security_group("ac-server-sg", "Security group for Assetto Corsa server"),
+        call.create_user_data_script("test-bucket", "packs/test-pack.tar.gz"),
+        call.launch_instance(
+            ami_id="ami-12345",
+            instance_type="t3.small",
+            security_group_id="sg-12345",
+            user_data="#!/bin/bash",
+            instance_name="test-instance",
+            key_name=None,
+            iam_instance_profile=None,
+        ),
+        call.get_instance_public_ip("i-12345"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "manager, method, failure",
+    [
+        ("s3_manager", "create_bucket", False),
+        ("s3_manager", "upload_pack", None),
+        ("ec2_manager", "create_security_group", None),
+        ("ec2_manager", "get_ubuntu_ami", None),
+        ("ec2_manager", "launch_instance", None),
+    ],
+)
+def test_deploy_step_fails(deployer: Deployer, manager: str, method: str, failure: object) -> None:
+    """Test deployment fails when any step fails."""
+    _mock_successful_deploy(deployer)
+    getattr(deployer, manager).configure_mock(**{f"{method}.return_value": failure})
+
+    result = deployer.deploy(PACK_FILE)
 
     assert result is None
 
 
-def test_deploy_instance_launch_fails(deployer: Deployer, tmp_path: Path) -> None:
-    """Test deployment when instance launch fails."""
-    pack_file = tmp_path / "test-pack.tar.gz"
-    pack_file.write_text("test content")
+def test_deploy_preflight_fails(deployer: Deployer) -> None:
+    """Test deployment stops before uploading when the launch preflight fails."""
+    _mock_successful_deploy(deployer)
+    deployer.ec2_manager.preflight_launch.return_value = False
 
-    deployer.s3_manager.create_bucket = MagicMock(return_value=True)
-    deployer.s3_manager.upload_pack = MagicMock(return_value="packs/test-pack.tar.gz")
-    deployer.ec2_manager.create_security_group = MagicMock(return_value="sg-12345")
-    deployer.ec2_manager.get_ubuntu_ami = MagicMock(return_value="ami-12345")
-    deployer.ec2_manager.create_user_data_script = MagicMock(return_value="#!/bin/bash")
-    deployer.ec2_manager.launch_instance = MagicMock(return_value=None)
-
-    result = deployer.deploy(pack_file)
+    result = deployer.deploy(PACK_FILE)
 
     assert result is None
+    deployer.s3_manager.upload_pack.assert_not_called()
 
 
-def test_stop_with_instance_id(deployer: Deployer) -> None:
-    """Test stopping instance with explicit instance ID."""
-    deployer.ec2_manager.stop_instance = MagicMock(return_value=True)
+@pytest.mark.parametrize("action, manager_method", INSTANCE_ACTIONS)
+def test_action_with_instance_id(deployer: Deployer, action: str, manager_method: str) -> None:
+    """Test stopping, starting and terminating an instance with explicit instance ID."""
+    setattr(deployer.ec2_manager, manager_method, Mock(return_value=True))
 
-    result = deployer.stop("i-12345")
+    result = getattr(deployer, action)("i-12345")
 
     assert result is True
-    deployer.ec2_manager.stop_instance.assert_called_once_with("i-12345")
+    getattr(deployer.ec2_manager, manager_method).assert_called_once_with("i-12345")
 
 
-def test_stop_by_name(deployer: Deployer) -> None:
-    """Test stopping instance by name."""
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=["i-12345"])
-    deployer.ec2_manager.stop_instance = MagicMock(return_value=True)
+@pytest.mark.parametrize("action, manager_method", INSTANCE_ACTIONS)
+def test_action_by_name(deployer: Deployer, action: str, manager_method: str) -> None:
+    """Test stopping, starting and terminating an instance found by name."""
+    deployer.ec2_manager.find_instances_by_name = Mock(return_value=["i-12345"])
+    setattr(deployer.ec2_manager, manager_method, Mock(return_value=True))
 
-    result = deployer.stop()
+    result = getattr(deployer, action)()
 
     assert result is True
-    deployer.ec2_manager.find_instances_by_name.assert_called_once()
-    deployer.ec2_manager.stop_instance.assert_called_once_with("i-12345")
+    deployer.ec2_manager.find_instances_by_name.assert_called_once_with("test-instance")
+    getattr(deployer.ec2_manager, manager_method).assert_called_once_with("i-12345")
 
 
 def test_stop_no_instances_found(deployer: Deployer) -> None:
     """Test stopping instance when none found."""
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=[])
+    deployer.ec2_manager.find_instances_by_name = Mock(return_value=[])
 
     result = deployer.stop()
 
     assert result is False
 
 
-def test_start_with_instance_id(deployer: Deployer) -> None:
-    """Test starting instance with explicit instance ID."""
-    deployer.ec2_manager.start_instance = MagicMock(return_value=True)
-
-    result = deployer.start("i-12345")
-
-    assert result is True
-    deployer.ec2_manager.start_instance.assert_called_once_with("i-12345")
-
-
-def test_start_by_name(deployer: Deployer) -> None:
-    """Test starting instance by name."""
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=["i-12345"])
-    deployer.ec2_manager.start_instance = MagicMock(return_value=True)
-
-    result = deployer.start()
-
-    assert result is True
-    deployer.ec2_manager.start_instance.assert_called_once_with("i-12345")
-
-
-def test_terminate_with_instance_id(deployer: Deployer) -> None:
-    """Test terminating instance with explicit instance ID."""
-    deployer.ec2_manager.terminate_instance = MagicMock(return_value=True)
-
-    result = deployer.terminate("i-12345")
-
-    assert result is True
-    deployer.ec2_manager.terminate_instance.assert_called_once_with("i-12345")
-
-
-def test_terminate_by_name(deployer: Deployer) -> None:
-    """Test terminating instance by name."""
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=["i-12345"])
-    deployer.ec2_manager.terminate_instance = MagicMock(return_value=True)
-
-    result = deployer.terminate()
-
-    assert result is True
-    deployer.ec2_manager.terminate_instance.assert_called_once_with("i-12345")
-
-
-def test_redeploy_success(deployer: Deployer, tmp_path: Path) -> None:
+def test_redeploy_success(deployer: Deployer) -> None:
     """Test successful redeployment."""
-    pack_file = tmp_path / "new-pack.tar.gz"
-    pack_file.write_text("new content")
-
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=["i-old"])
-    deployer.ec2_manager.terminate_instance = MagicMock(return_value=True)
+    deployer.ec2_manager.find_instances_by_name = Mock(return_value=["i-old"])
+    deployer.ec2_manager.terminate_instance = Mock(return_value=True)
 
     # Mock deploy method
-    deployer.deploy = MagicMock(return_value="i-new")
+    deployer.deploy = Mock(return_value="i-new")
 
-    result = deployer.redeploy(pack_file)
+    result = deployer.redeploy(PACK_FILE)
 
     assert result == "i-new"
     deployer.ec2_manager.terminate_instance.assert_called_once()
-    deployer.deploy.assert_called_once_with(pack_file)
+    deployer.deploy.assert_called_once_with(PACK_FILE)
 
 
-def test_redeploy_terminate_fails_continues(deployer: Deployer, tmp_path: Path) -> None:
+def test_redeploy_terminate_fails_continues(deployer: Deployer) -> None:
     """Test redeployment continues even if terminate fails."""
-    pack_file = tmp_path / "new-pack.tar.gz"
-    pack_file.write_text("new content")
-
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=["i-old"])
-    deployer.ec2_manager.terminate_instance = MagicMock(return_value=False)
-    deployer.deploy = MagicMock(return_value="i-new")
+    deployer.ec2_manager.find_instances_by_name = Mock(return_value=["i-old"])
+    deployer.ec2_manager.terminate_instance = Mock(return_value=False)
+    deployer.deploy = Mock(return_value="i-new")
 
-    result = deployer.redeploy(pack_file)
+    result = deployer.redeploy(PACK_FILE)
 
     assert result == "i-new"
     deployer.deploy.assert_called_once()
@@ -237,51 +196,29 @@ def test_redeploy_terminate_fails_continues(deployer: Deployer, tmp_path: Path)
 
 def test_get_status_with_instance_id(deployer: Deployer) -> None:
     """Test getting status with instance ID."""
-    from datetime import datetime
-
-    mock_details = {
-        "instance_id": "i-12345",
-        "state": "running",
-        "instance_type": "t3.small",
-        "public_ip": "1.2.3.4",
-        "private_ip": "10.0.0.1",
-        "launch_time": datetime(2024, 1, 1),
-        "name": "test-instance",
-    }
-    deployer.ec2_manager.get_instance_details = MagicMock(return_value=mock_details)
+    deployer.ec2_manager.get_instance_details = Mock(return_value=INSTANCE_DETAILS)
 
     result = deployer.get_status("i-12345")
 
-    assert result == mock_details
+    assert result == INSTANCE_DETAILS
     deployer.ec2_manager.get_instance_details.assert_called_once_with("i-12345")
 
 
 def test_get_status_by_name(deployer: Deployer) -> None:
     """Test getting status by instance name."""
-    from datetime import datetime
-
-    mock_details = {
-        "instance_id": "i-12345",
-        "state": "running",
-        "instance_type": "t3.small",
-        "public_ip": "1.2.3.4",
-        "private_ip": "10.0.0.1",
-        "launch_time": datetime(2024, 1, 1),
-        "name": "test-instance",
-    }
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=["i-12345"])
-    deployer.ec2_manager.get_instance_details = MagicMock(return_value=mock_details)
+    deployer.ec2_manager.find_instances_by_name = Mock(return_value=["i-12345"])
+    deployer.ec2_manager.get_instance_details = Mock(return_value=INSTANCE_DETAILS)
 
     result = deployer.get_status()
 
-    assert result == mock_details
+    assert result == INSTANCE_DETAILS
     deployer.ec2_manager.find_instances_by_name.assert_called_once_with("test-instance")
     deployer.ec2_manager.get_instance_details.assert_called_once_with("i-12345")
 
 
 def test_get_status_no_instance_found(deployer: Deployer) -> None:
     """Test getting status when no instance found."""
-    deployer.ec2_manager.find_instances_by_name = MagicMock(return_value=[])
+    deployer.ec2_manager.find_instances_by_name = Mock(return_value=[])
 
     result = deployer.get_status()
 
@@ -1,16 +1,140 @@
 """Unit tests for EC2Manager."""
 
+import gzip
+from datetime import datetime
+from typing import Optional
 from unittest.mock import MagicMock, patch
 import pytest
-
-from ac_server_manager.ec2_manager import EC2Manager
+from botocore.exceptions import ClientError, WaiterError
+
+from ac_server_manager.config import AC_SERVER_HTTP_PORT, AC_SERVER_TCP_PORT, AC_SERVER_UDP_PORT
+from ac_server_manager.ec2_manager import INSTANCE_WAIT_MAX_ATTEMPTS, EC2Manager
+
+
+def _describe_response(*instances: dict) -> dict:
+    """Wrap instance descriptions in a single-reservation describe_instances response."""
+    if not instances:
+        return {"Reservations": []}
+    return {"Reservations": [{"Instances": list(instances)}]}
+
+
+# describe_instances entry and response for a running, tagged instance
+RUNNING_INSTANCE = {
+    "InstanceId": "i-12345",
+    "State": {"Name": "running"},
+    "InstanceType": "t3.small",
+    "PublicIpAddress": "1.2.3.4",
+    "PrivateIpAddress": "10.0.0.1",
+    "LaunchTime": datetime(2024, 1, 1),
+    "Tags": [
+        {"Key": "Name", "Value": "test-instance"},
+        {"Key": "Application", "Value": "ac-server"},
+    ],
+}
+RUNNING_INSTANCE_RESPONSE = _describe_response(RUNNING_INSTANCE)
+
+# Fragments every rendered user data script must contain
+USER_DATA_TOKENS = frozenset(
+    {
+        # Basic script structure
+        "#!/bin/bash",
+        "set -euo pipefail",
+        # Required packages installation
+        "awscli",
+        "unzip",
+        "wget",
+        "tar",
+        "jq",
+        "lib32gcc-s1",
+        "lib32stdc++6",
+        "/var/lib/ac-server-manager/deps-installed",  # apt skipped on custom AMIs
+        "rm -rf /opt/acserver",
+        # Background EBS pre-warm
+        "of=/dev/null",
+        # S3 download with retries
+        "aws s3 cp s3://test-bucket/packs/test.tar.gz",
+        "MAX_RETRIES",
+        "RETRY_DELAY",
+        # Pack extraction and verification
+        "tar -xzf server-pack.tar.gz",
+        # Binary location and verification
+        "find /opt/acserver",
+        "od -An -tx1 -N4",  # magic-byte read to check binary type
+        "7f454c46",  # ELF magic
+        "4d5a",  # PE "MZ" magic
+        "ELF",
+        # Binary permissions - now uses variable
+        "chmod +x",
+        "chown root:root",
+        # ldd check for dependencies
+        "ldd",
+        # Systemd service creation with dynamic path
+        "systemctl daemon-reload",
+        "systemctl enable acserver",
+        "systemctl start acserver",
+        "/etc/systemd/system/acserver.service",
+        "WorkingDirectory=",
+        "ExecStart=",
+        # Validation timeout
+        "VALIDATION_TIMEOUT",
+        # Process validation
+        "pgrep",
+        # Port validation from a single ss snapshot with netstat fallback
+        "ss -tulnp",
+        "netstat -tulnp",
+        # Port constants and usage
+        "AC_SERVER_TCP_PORT=9600",
+        "AC_SERVER_UDP_PORT=9600",
+        "AC_SERVER_HTTP_PORT=8081",
+        # Ports are now referenced via variables
+        "$AC_SERVER_TCP_PORT",
+        "$AC_SERVER_UDP_PORT",
+        "$AC_SERVER_HTTP_PORT",
+        # HTTP endpoint check
+        "curl",
+        "http://127.0.0.1",
+        # Public IP retrieval
+        "169.254.169.254/latest/meta-data/public-ipv4",
+        "X-aws-ec2-metadata-token",  # IMDSv2
+        # acstuff join link
+        "acstuff",
+        # Log validation - common error patterns
+        "track not found",
+        "content not found",
+        "missing track",
+        "failed to bind",
+        "port.*in use",
+        "address already in use",
+        "permission denied",
+        "segmentation fault",
+        # Status file
+        "/opt/acserver/deploy-status.json",
+        "STATUS_FILE",
+        "write_status",
+        '"success":',
+        '"timestamp":',
+        '"public_ip":',
+        '"error_messages":',
+        # Deployment log
+        "/var/log/acserver-deploy.log",
+        "DEPLOY_LOG",
+        "log_message",
+        # Exit codes
+        "exit 1",  # Failure case
+        "exit 0",  # Success case
+        "VALIDATION FAILED",
+        "VALIDATION PASSED",
+        # Error tracking
+        "ERROR_MESSAGES",
+        "add_error",
+    }
+)
 
 
 @pytest.fixture
 def ec2_manager() -> EC2Manager:
     """Create EC2Manager instance for testing."""
-    with patch("boto3.client"), patch("boto3.resource"):
-        return EC2Manager("us-east-1")
+    return EC2Manager("us-east-1")
 
 
 def test_ec2_manager_init(ec2_manager: EC2Manager) -> None:
@@ -42,8 +166,30 @@ def test_create_security_group_new(ec2_manager: EC2Manager) -> None:
     ec2_manager.ec2_client.authorize_security_group_ingress.assert_called_once()
 
 
+def test_create_security_group_ingress_rules(ec2_manager: EC2Manager) -> None:
+    """Test create_security_group opens SSH and all AC server ports."""
+    ec2_manager.ec2_client.describe_security_groups = MagicMock(return_value={"SecurityGroups": []})
+    ec2_manager.ec2_client.create_security_group = MagicMock(return_value={"GroupId": "sg-67890"})
+    ec2_manager.ec2_client.authorize_security_group_ingress = MagicMock()
+
+    ec2_manager.create_security_group("test-sg", "Test security group")
+
+    call_args = ec2_manager.ec2_client.authorize_security_group_ingress.call_args[1]
+    assert call_args["GroupId"] == "sg-67890"
+    rules = {(rule["IpProtocol"], rule["FromPort"]) for rule in call_args["IpPermissions"]}
+    assert rules == {
+        ("tcp", 22),
+        ("tcp", AC_SERVER_HTTP_PORT),
+        ("tcp", AC_SERVER_TCP_PORT),
+        ("udp", AC_SERVER_UDP_PORT),
+    }
+
+
 def test_get_ubuntu_ami_success(ec2_manager: EC2Manager) -> None:
     """Test getting Ubuntu AMI."""
+    ec2_manager.ssm_client.get_parameter = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "ParameterNotFound"}}, "get_parameter")
+    )
     ec2_manager.ec2_client.describe_images = MagicMock(
         return_value={
             "Images": [
@@ -60,6 +206,9 @@ def test_get_ubuntu_ami_success(ec2_manager: EC2Manager) -> None:
 
 def test_get_ubuntu_ami_not_found(ec2_manager: EC2Manager) -> None:
     """Test getting Ubuntu AMI when none found."""
+    ec2_manager.ssm_client.get_parameter = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "ParameterNotFound"}}, "get_parameter")
+    )
     ec2_manager.ec2_client.describe_images = MagicMock(return_value={"Images": []})
 
     result = ec2_manager.get_ubuntu_ami()
@@ -67,116 +216,124 @@ def test_get_ubuntu_ami_not_found(ec2_manager: EC2Manager) -> None:
     assert result is None
 
 
+def test_get_ubuntu_ami_prefers_custom_ami(ec2_manager: EC2Manager) -> None:
+    """Test getting Ubuntu AMI returns the registered custom AMI."""
+    ec2_manager.ssm_client.get_parameter = MagicMock(
+        return_value={"Parameter": {"Value": "ami-custom"}}
+    )
+    ec2_manager.ec2_client.describe_images = MagicMock(
+        return_value={"Images": [{"ImageId": "ami-custom", "State": "available"}]}
+    )
+
+    result = ec2_manager.get_ubuntu_ami()
+
+    assert result == "ami-custom"
+    ec2_manager.ssm_client.get_parameter.assert_called_once_with(
+        Name="/ac-server-manager/ami/us-east-1"
+    )
+    ec2_manager.ec2_client.describe_images.assert_called_once_with(ImageIds=["ami-custom"])
+
+
+def test_get_ubuntu_ami_falls_back_when_custom_ami_deregistered(
+    ec2_manager: EC2Manager,
+) -> None:
+    """Test getting Ubuntu AMI ignores a registered custom AMI that no longer exists."""
+    ec2_manager.ssm_client.get_parameter = MagicMock(
+        return_value={"Parameter": {"Value": "ami-custom"}}
+    )
+    ec2_manager.ec2_client.describe_images = MagicMock(
+        side_effect=[
+            ClientError({"Error": {"Code": "InvalidAMIID.NotFound"}}, "describe_images"),
+            {"Images": [{"ImageId": "ami-stock", "CreationDate": "2023-12-01T00:00:00.000Z"}]},
+        ]
+    )
+
+    result = ec2_manager.get_ubuntu_ami()
+
+    assert result == "ami-stock"
+
+
+def test_build_custom_ami(ec2_manager: EC2Manager) -> None:
+    """Test building a custom AMI registers it in SSM."""
+    ec2_manager.ec2_client.create_image.return_value = {"ImageId": "ami-custom"}
+
+    result = ec2_manager.build_custom_ami("i-12345", "test-image")
+
+    assert result == "ami-custom"
+    ec2_manager.ec2_client.get_waiter.return_value.wait.assert_called_once()
+    ec2_manager.ec2_client.create_image.assert_called_once()
+    assert ec2_manager.ec2_client.create_image.call_args[1]["Name"] == "test-image"
+    call_args = ec2_manager.ssm_client.put_parameter.call_args[1]
+    assert call_args["Name"] == "/ac-server-manager/ami/us-east-1"
+    assert call_args["Value"] == "ami-custom"
+    assert call_args["Overwrite"] is True
+
+
+def test_build_custom_ami_wait_failure(ec2_manager: EC2Manager) -> None:
+    """Test building a custom AMI fails cleanly when the image never becomes available."""
+    ec2_manager.ec2_client.configure_mock(
+        **{
+            "create_image.return_value": {"ImageId": "ami-custom"},
+            "get_waiter.return_value.wait.side_effect": WaiterError(
+                "ImageAvailable", "Max attempts exceeded", {}
+            ),
+        }
+    )
+
+    result = ec2_manager.build_custom_ami("i-12345", "test-image")
+
+    assert result is None
+    ec2_manager.ssm_client.put_parameter.assert_not_called()
+
+
+def test_create_user_data_script_reuses_rendered_script(ec2_manager: EC2Manager) -> None:
+    """Test identical deployments reuse the rendered user data script."""
+    first = ec2_manager.create_user_data_script("test-bucket", "packs/test.tar.gz")
+    second = ec2_manager.create_user_data_script("test-bucket", "packs/test.tar.gz")
+    other = ec2_manager.create_user_data_script("test-bucket", "packs/other.tar.gz")
+
+    assert first is second
+    assert "packs/other.tar.gz" in other
+    assert "packs/test.tar.gz" not in other
+
+
 def test_create_user_data_script(ec2_manager: EC2Manager) -> None:
     """Test user data script creation."""
     script = ec2_manager.create_user_data_script("test-bucket", "packs/test.tar.gz")
 
-    # Basic script structure
-    assert "#!/bin/bash" in script
-    assert "set -euo pipefail" in script
-
-    # Required packages installation
-    assert "awscli" in script
-    assert "unzip" in script
-    assert "wget" in script
-    assert "tar" in script
-    assert "jq" in script
-    assert "lib32gcc-s1" in script
-    assert "lib32stdc++6" in script
+    missing = {token for token in USER_DATA_TOKENS if token not in script}
+    assert not missing, f"Missing from user data script: {sorted(missing)}"
+
+    # Alternatives the script may use either of
     assert "iproute2" in script or "net-tools" in script
+    assert "acServer" in script or "acserver" in script
+    assert "PE32" in script or "Windows" in script  # Check for Windows binary detection
+    assert script.count("meta-data/public-ipv4") == 1
 
-    # S3 download with retries
-    assert "aws s3 cp s3://test-bucket/packs/test.tar.gz" in script
-    assert "MAX_RETRIES" in script
-    assert "RETRY_DELAY" in script
 
-    # Pack extraction and verification
-    assert "tar -xzf server-pack.tar.gz" in script
+def test_preflight_launch_success(ec2_manager: EC2Manager) -> None:
+    """Test launch preflight treats DryRunOperation as success."""
+    ec2_manager.ec2_client.run_instances = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "DryRunOperation"}}, "run_instances")
+    )
 
-    # Binary location and verification
-    assert "find /opt/acserver" in script
-    assert "acServer" in script or "acserver" in script
-    assert "file" in script  # file command to check binary type
-    assert "ELF" in script
-    assert "PE32" in script or "Windows" in script  # Check for Windows binary detection
+    result = ec2_manager.preflight_launch("ami-12345", "t3.small", key_name="my-key")
 
-    # Binary permissions - now uses variable
-    assert "chmod +x" in script
-    assert "chown root:root" in script
-
-    # ldd check for dependencies
-    assert "ldd" in script
-
-    # Systemd service creation with dynamic path
-    assert "systemctl daemon-reload" in script
-    assert "systemctl enable acserver" in script
-    assert "systemctl start acserver" in script
-    assert "/etc/systemd/system/acserver.service" in script
-    assert "WorkingDirectory=" in script
-    assert "ExecStart=" in script
-
-    # Validation timeout
-    assert "VALIDATION_TIMEOUT" in script
-
-    # Process validation
-    assert "pgrep" in script
-
-    # Port validation with both ss and netstat fallback
-    assert "ss -tlnp" in script or "netstat -tlnp" in script
-    assert "ss -ulnp" in script or "netstat -ulnp" in script
-
-    # Port constants and usage
-    assert "AC_SERVER_TCP_PORT=9600" in script
-    assert "AC_SERVER_UDP_PORT=9600" in script
-    assert "AC_SERVER_HTTP_PORT=8081" in script
-    # Ports are now referenced via variables
-    assert "$AC_SERVER_TCP_PORT" in script
-    assert "$AC_SERVER_UDP_PORT" in script
-    assert "$AC_SERVER_HTTP_PORT" in script
-
-    # HTTP endpoint check
-    assert "curl" in script
-    assert "http://127.0.0.1" in script
-
-    # Public IP retrieval
-    assert "169.254.169.254/latest/meta-data/public-ipv4" in script
-
-    # acstuff join link
-    assert "acstuff" in script
-
-    # Log validation - common error patterns
-    assert "track not found" in script
-    assert "content not found" in script
-    assert "missing track" in script
-    assert "failed to bind" in script
-    assert "port.*in use" in script
-    assert "address already in use" in script
-    assert "permission denied" in script
-    assert "segmentation fault" in script
-
-    # Status file
-    assert "/opt/acserver/deploy-status.json" in script
-    assert "STATUS_FILE" in script
-    assert "write_status" in script
-    assert '"success":' in script
-    assert '"timestamp":' in script
-    assert '"public_ip":' in script
-    assert '"error_messages":' in script
-
-    # Deployment log
-    assert "/var/log/acserver-deploy.log" in script
-    assert "DEPLOY_LOG" in script
-    assert "log_message" in script
-
-    # Exit codes
-    assert "exit 1" in script  # Failure case
-    assert "exit 0" in script  # Success case
-    assert "VALIDATION FAILED" in script
-    assert "VALIDATION PASSED" in script
-
-    # Error tracking
-    assert "ERROR_MESSAGES" in script
-    assert "add_error" in script
+    assert result is True
+    call_args = ec2_manager.ec2_client.run_instances.call_args[1]
+    assert call_args["DryRun"] is True
+    assert call_args["KeyName"] == "my-key"
+
+
+def test_preflight_launch_failure(ec2_manager: EC2Manager) -> None:
+    """Test launch preflight reports invalid launch settings."""
+    ec2_manager.ec2_client.run_instances = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "InvalidAMIID.NotFound"}}, "run_instances")
+    )
+
+    result = ec2_manager.preflight_launch("ami-missing", "t3.small")
+
+    assert result is False
 
 
 def test_launch_instance_success(ec2_manager: EC2Manager) -> None:
@@ -184,7 +341,7 @@ def test_launch_instance_success(ec2_manager: EC2Manager) -> None:
     ec2_manager.ec2_client.run_instances = MagicMock(
         return_value={"Instances": [{"InstanceId": "i-12345"}]}
     )
-    ec2_manager.ec2_client.get_waiter = MagicMock()
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=RUNNING_INSTANCE_RESPONSE)
 
     result = ec2_manager.launch_instance(
         ami_id="ami-12345",
@@ -196,6 +353,80 @@ def test_launch_instance_success(ec2_manager: EC2Manager) -> None:
 
     assert result == "i-12345"
     ec2_manager.ec2_client.run_instances.assert_called_once()
+    user_data = ec2_manager.ec2_client.run_instances.call_args[1]["UserData"]
+    assert gzip.decompress(user_data) == b"#!/bin/bash"
+
+
+def test_launch_instance_polls_until_running(ec2_manager: EC2Manager) -> None:
+    """Test instance launch polls with increasing delays until running."""
+    ec2_manager.ec2_client.run_instances = MagicMock(
+        return_value={"Instances": [{"InstanceId": "i-12345"}]}
+    )
+    ec2_manager.ec2_client.describe_instances = MagicMock(
+        side_effect=[
+            ClientError({"Error": {"Code": "InvalidInstanceID.NotFound"}}, "describe_instances"),
+            _describe_response({"InstanceId": "i-12345", "State": {"Name": "pending"}}),
+            _describe_response({"InstanceId": "i-12345", "State": {"Name": "running"}}),
+        ]
+    )
+
+    with patch("time.sleep") as mock_sleep:
+        result = ec2_manager.launch_instance(
+            ami_id="ami-12345",
+            instance_type="t3.small",
+            security_group_id="sg-12345",
+            user_data="#!/bin/bash",
+            instance_name="test-instance",
+        )
+
+    assert result == "i-12345"
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert len(delays) == 2
+    assert 2.0 <= delays[0] <= 2.2
+    assert 4.0 <= delays[1] <= 4.4
+
+
+def test_launch_instance_times_out_without_final_sleep(ec2_manager: EC2Manager) -> None:
+    """Test instance launch gives up after the last attempt without sleeping again."""
+    ec2_manager.ec2_client.run_instances = MagicMock(
+        return_value={"Instances": [{"InstanceId": "i-12345"}]}
+    )
+    ec2_manager.ec2_client.describe_instances = MagicMock(
+        return_value=_describe_response({"InstanceId": "i-12345", "State": {"Name": "pending"}})
+    )
+
+    with patch("time.sleep") as mock_sleep:
+        result = ec2_manager.launch_instance(
+            ami_id="ami-12345",
+            instance_type="t3.small",
+            security_group_id="sg-12345",
+            user_data="#!/bin/bash",
+            instance_name="test-instance",
+        )
+
+    assert result is None
+    assert ec2_manager.ec2_client.describe_instances.call_count == INSTANCE_WAIT_MAX_ATTEMPTS
+    assert mock_sleep.call_count == INSTANCE_WAIT_MAX_ATTEMPTS - 1
+
+
+def test_launch_instance_fails_when_terminated(ec2_manager: EC2Manager) -> None:
+    """Test instance launch fails if the instance terminates while waiting."""
+    ec2_manager.ec2_client.run_instances = MagicMock(
+        return_value={"Instances": [{"InstanceId": "i-12345"}]}
+    )
+    ec2_manager.ec2_client.describe_instances = MagicMock(
+        return_value=_describe_response({"InstanceId": "i-12345", "State": {"Name": "terminated"}})
+    )
+
+    result = ec2_manager.launch_instance(
+        ami_id="ami-12345",
+        instance_type="t3.small",
+        security_group_id="sg-12345",
+        user_data="#!/bin/bash",
+        instance_name="test-instance",
+    )
+
+    assert result is None
 
 
 def test_launch_instance_with_key(ec2_manager: EC2Manager) -> None:
@@ -203,7 +434,7 @@ def test_launch_instance_with_key(ec2_manager: EC2Manager) -> None:
     ec2_manager.ec2_client.run_instances = MagicMock(
         return_value={"Instances": [{"InstanceId": "i-12345"}]}
     )
-    ec2_manager.ec2_client.get_waiter = MagicMock()
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=RUNNING_INSTANCE_RESPONSE)
 
     result = ec2_manager.launch_instance(
         ami_id="ami-12345",
@@ -221,9 +452,7 @@ def test_launch_instance_with_key(ec2_manager: EC2Manager) -> None:
 
 def test_get_instance_public_ip(ec2_manager: EC2Manager) -> None:
     """Test getting instance public IP."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(
-        return_value={"Reservations": [{"Instances": [{"PublicIpAddress": "1.2.3.4"}]}]}
-    )
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=RUNNING_INSTANCE_RESPONSE)
 
     result = ec2_manager.get_instance_public_ip("i-12345")
 
@@ -232,87 +461,104 @@ def test_get_instance_public_ip(ec2_manager: EC2Manager) -> None:
 
 def test_get_instance_public_ip_not_found(ec2_manager: EC2Manager) -> None:
     """Test getting instance public IP when not found."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(return_value={"Reservations": []})
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=_describe_response())
 
     result = ec2_manager.get_instance_public_ip("i-12345")
 
     assert result is None
 
 
-def test_stop_instance(ec2_manager: EC2Manager) -> None:
-    """Test stopping instance."""
-    ec2_manager.ec2_client.stop_instances = MagicMock()
-
-    result = ec2_manager.stop_instance("i-12345")
-
-    assert result is True
-    ec2_manager.ec2_client.stop_instances.assert_called_once_with(InstanceIds=["i-12345"])
-
-
-def test_start_instance(ec2_manager: EC2Manager) -> None:
-    """Test starting instance."""
-    ec2_manager.ec2_client.start_instances = MagicMock()
+@pytest.mark.parametrize(
+    "method, api",
+    [
+        ("stop_instance", "stop_instances"),
+        ("start_instance", "start_instances"),
+        ("terminate_instance", "terminate_instances"),
+    ],
+)
+def test_instance_lifecycle(ec2_manager: EC2Manager, method: str, api: str) -> None:
+    """Test stopping, starting and terminating an instance."""
+    setattr(ec2_manager.ec2_client, api, MagicMock())
 
-    result = ec2_manager.start_instance("i-12345")
+    result = getattr(ec2_manager, method)("i-12345")
 
     assert result is True
-    ec2_manager.ec2_client.start_instances.assert_called_once_with(InstanceIds=["i-12345"])
+    getattr(ec2_manager.ec2_client, api).assert_called_once_with(InstanceIds=["i-12345"])
 
 
-def test_terminate_instance(ec2_manager: EC2Manager) -> None:
-    """Test terminating instance."""
-    ec2_manager.ec2_client.terminate_instances = MagicMock()
+def test_terminate_instance_and_wait_success(ec2_manager: EC2Manager) -> None:
+    """Test terminating instance with wait."""
+    ec2_manager.ec2_client.describe_instances = MagicMock()
+    ec2_manager.ec2_client.describe_instance_status = MagicMock(
+        side_effect=[
+            {"InstanceStatuses": [{"InstanceId": "i-12345", "InstanceState": {"Name": state}}]}
+            for state in ("shutting-down", "terminated")
+        ]
+    )
+    ec2_manager.ec2_client.terminate_instances = MagicMock(
+        return_value={
+            "TerminatingInstances": [
+                {"InstanceId": "i-12345", "CurrentState": {"Name": "shutting-down"}}
+            ]
+        }
+    )
 
-    result = ec2_manager.terminate_instance("i-12345")
+    with patch("time.sleep") as mock_sleep:
+        result = ec2_manager.terminate_instance_and_wait("i-12345")
 
     assert result is True
-    ec2_manager.ec2_client.terminate_instances.assert_called_once_with(InstanceIds=["i-12345"])
+    ec2_manager.ec2_client.terminate_instances.assert_called_once()
+    ec2_manager.ec2_client.describe_instances.assert_not_called()
+    assert ec2_manager.ec2_client.describe_instance_status.call_args[1] == {
+        "InstanceIds": ["i-12345"],
+        "IncludeAllInstances": True,
+    }
+    mock_sleep.assert_called_once()
 
 
-def test_terminate_instance_and_wait_success(ec2_manager: EC2Manager) -> None:
-    """Test terminating instance with wait."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(
+def test_terminate_instance_and_wait_instance_gone(ec2_manager: EC2Manager) -> None:
+    """Test an instance missing from describe_instance_status counts as terminated."""
+    ec2_manager.ec2_client.terminate_instances = MagicMock(
         return_value={
-            "Reservations": [
-                {"Instances": [{"InstanceId": "i-12345", "State": {"Name": "running"}}]}
+            "TerminatingInstances": [
+                {"InstanceId": "i-12345", "CurrentState": {"Name": "shutting-down"}}
             ]
         }
     )
-    ec2_manager.ec2_client.terminate_instances = MagicMock()
-    mock_waiter = MagicMock()
-    ec2_manager.ec2_client.get_waiter = MagicMock(return_value=mock_waiter)
+    ec2_manager.ec2_client.describe_instance_status = MagicMock(
+        return_value={"InstanceStatuses": []}
+    )
 
-    result = ec2_manager.terminate_instance_and_wait("i-12345")
+    with patch("time.sleep") as mock_sleep:
+        result = ec2_manager.terminate_instance_and_wait("i-12345")
 
     assert result is True
-    ec2_manager.ec2_client.terminate_instances.assert_called_once()
-    mock_waiter.wait.assert_called_once()
+    ec2_manager.ec2_client.describe_instance_status.assert_called_once()
+    mock_sleep.assert_not_called()
 
 
 def test_terminate_instance_and_wait_already_terminated(ec2_manager: EC2Manager) -> None:
     """Test terminating instance that's already terminated."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(
+    ec2_manager.ec2_client.terminate_instances = MagicMock(
         return_value={
-            "Reservations": [
-                {"Instances": [{"InstanceId": "i-12345", "State": {"Name": "terminated"}}]}
+            "TerminatingInstances": [
+                {"InstanceId": "i-12345", "CurrentState": {"Name": "terminated"}}
             ]
         }
     )
-    ec2_manager.ec2_client.terminate_instances = MagicMock()
+    ec2_manager.ec2_client.describe_instance_status = MagicMock()
 
     result = ec2_manager.terminate_instance_and_wait("i-12345")
 
     assert result is True
-    ec2_manager.ec2_client.terminate_instances.assert_not_called()
+    ec2_manager.ec2_client.describe_instance_status.assert_not_called()
 
 
 def test_terminate_instance_and_wait_not_found(ec2_manager: EC2Manager) -> None:
     """Test terminating instance that doesn't exist."""
-    from botocore.exceptions import ClientError
-
-    ec2_manager.ec2_client.describe_instances = MagicMock(
+    ec2_manager.ec2_client.terminate_instances = MagicMock(
         side_effect=ClientError(
-            {"Error": {"Code": "InvalidInstanceID.NotFound"}}, "describe_instances"
+            {"Error": {"Code": "InvalidInstanceID.NotFound"}}, "terminate_instances"
         )
     )
 
@@ -323,121 +569,143 @@ def test_terminate_instance_and_wait_not_found(ec2_manager: EC2Manager) -> None:
 
 def test_terminate_instance_and_wait_dry_run(ec2_manager: EC2Manager) -> None:
     """Test terminating instance in dry-run mode."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(
-        return_value={
-            "Reservations": [
-                {"Instances": [{"InstanceId": "i-12345", "State": {"Name": "running"}}]}
-            ]
-        }
-    )
+    ec2_manager.ec2_client.describe_instances = MagicMock()
     ec2_manager.ec2_client.terminate_instances = MagicMock()
 
     result = ec2_manager.terminate_instance_and_wait("i-12345", dry_run=True)
 
     assert result is True
     ec2_manager.ec2_client.terminate_instances.assert_not_called()
+    ec2_manager.ec2_client.describe_instances.assert_not_called()
 
 
 def test_find_instances_by_name(ec2_manager: EC2Manager) -> None:
     """Test finding instances by name."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(
-        return_value={
-            "Reservations": [
-                {"Instances": [{"InstanceId": "i-12345"}]},
-                {"Instances": [{"InstanceId": "i-67890"}]},
-            ]
-        }
-    )
+    paginator = MagicMock()
+    paginator.paginate.return_value = [
+        _describe_response({"InstanceId": "i-12345"}),
+        _describe_response({"InstanceId": "i-67890"}),
+    ]
+    ec2_manager.ec2_client.get_paginator = MagicMock(return_value=paginator)
 
     result = ec2_manager.find_instances_by_name("test-instance")
 
     assert len(result) == 2
     assert "i-12345" in result
     assert "i-67890" in result
+    ec2_manager.ec2_client.get_paginator.assert_called_once_with("describe_instances")
+    assert paginator.paginate.call_args[1]["PaginationConfig"] == {"PageSize": 1000}
 
 
 def test_find_instances_by_name_none_found(ec2_manager: EC2Manager) -> None:
     """Test finding instances by name when none exist."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(return_value={"Reservations": []})
+    paginator = MagicMock()
+    paginator.paginate.return_value = [_describe_response()]
+    ec2_manager.ec2_client.get_paginator = MagicMock(return_value=paginator)
 
     result = ec2_manager.find_instances_by_name("test-instance")
 
     assert result == []
 
 
-def test_get_instance_details_success(ec2_manager: EC2Manager) -> None:
-    """Test getting instance details successfully."""
-    from datetime import datetime
+def test_find_instances_by_name_empty_name(ec2_manager: EC2Manager) -> None:
+    """Test an empty name does not trigger an unfiltered scan."""
+    ec2_manager.ec2_client.get_paginator = MagicMock()
 
-    ec2_manager.ec2_client.describe_instances = MagicMock(
-        return_value={
-            "Reservations": [
-                {
-                    "Instances": [
-                        {
-                            "InstanceId": "i-12345",
-                            "State": {"Name": "running"},
-                            "InstanceType": "t3.small",
-                            "PublicIpAddress": "1.2.3.4",
-                            "PrivateIpAddress": "10.0.0.1",
-                            "LaunchTime": datetime(2024, 1, 1),
-                            "Tags": [
-                                {"Key": "Name", "Value": "test-instance"},
-                                {"Key": "Application", "Value": "ac-server"},
-                            ],
-                        }
-                    ]
-                }
-            ]
-        }
-    )
+    result = ec2_manager.find_instances_by_name("")
+
+    assert result == []
+    ec2_manager.ec2_client.get_paginator.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "overrides, expected_state, expected_public_ip",
+    [
+        pytest.param({}, "running", "1.2.3.4", id="running"),
+        pytest.param(
+            {"State": {"Name": "stopped"}, "PublicIpAddress": None},
+            "stopped",
+            None,
+            id="no_public_ip",
+        ),
+    ],
+)
+def test_get_instance_details(
+    ec2_manager: EC2Manager,
+    overrides: dict,
+    expected_state: str,
+    expected_public_ip: Optional[str],
+) -> None:
+    """Test getting instance details for running and stopped instances."""
+    # A None override drops the field, as EC2 omits unset attributes
+    instance = {k: v for k, v in {**RUNNING_INSTANCE, **overrides}.items() if v is not None}
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=_describe_response(instance))
 
     result = ec2_manager.get_instance_details("i-12345")
 
-    assert result is not None
-    assert result["instance_id"] == "i-12345"
-    assert result["state"] == "running"
-    assert result["instance_type"] == "t3.small"
-    assert result["public_ip"] == "1.2.3.4"
-    assert result["private_ip"] == "10.0.0.1"
-    assert result["name"] == "test-instance"
+    assert result == {
+        "instance_id": "i-12345",
+        "state": expected_state,
+        "instance_type": "t3.small",
+        "public_ip": expected_public_ip,
+        "private_ip": "10.0.0.1",
+        "launch_time": datetime(2024, 1, 1),
+        "name": "test-instance",
+    }
 
 
 def test_get_instance_details_not_found(ec2_manager: EC2Manager) -> None:
     """Test getting instance details when instance not found."""
-    ec2_manager.ec2_client.describe_instances = MagicMock(return_value={"Reservations": []})
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=_describe_response())
 
     result = ec2_manager.get_instance_details("i-99999")
 
     assert result is None
 
 
-def test_get_instance_details_no_public_ip(ec2_manager: EC2Manager) -> None:
-    """Test getting instance details when no public IP assigned."""
-    from datetime import datetime
+def test_get_instance_details_uses_cache(ec2_manager: EC2Manager) -> None:
+    """Test repeated lookups of the same instance reuse the cached response."""
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=RUNNING_INSTANCE_RESPONSE)
 
-    ec2_manager.ec2_client.describe_instances = MagicMock(
-        return_value={
-            "Reservations": [
-                {
-                    "Instances": [
-                        {
-                            "InstanceId": "i-12345",
-                            "State": {"Name": "stopped"},
-                            "InstanceType": "t3.small",
-                            "PrivateIpAddress": "10.0.0.1",
-                            "LaunchTime": datetime(2024, 1, 1),
-                            "Tags": [{"Key": "Name", "Value": "test-instance"}],
-                        }
-                    ]
-                }
-            ]
-        }
+    details = ec2_manager.get_instance_details("i-12345")
+    public_ip = ec2_manager.get_instance_public_ip("i-12345")
+
+    assert details is not None
+    assert public_ip == "1.2.3.4"
+    ec2_manager.ec2_client.describe_instances.assert_called_once()
+
+    ec2_manager.get_instance_details("i-12345", refresh=True)
+
+    assert ec2_manager.ec2_client.describe_instances.call_count == 2
+
+
+def test_stop_instance_invalidates_cache(ec2_manager: EC2Manager) -> None:
+    """Test state-changing calls drop the cached instance description."""
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=RUNNING_INSTANCE_RESPONSE)
+    ec2_manager.ec2_client.stop_instances = MagicMock()
+
+    ec2_manager.get_instance_public_ip("i-12345")
+    ec2_manager.stop_instance("i-12345")
+    ec2_manager.get_instance_public_ip("i-12345")
+
+    assert ec2_manager.ec2_client.describe_instances.call_count == 2
+
+
+def test_launch_instance_primes_cache_for_public_ip(ec2_manager: EC2Manager) -> None:
+    """Test the public IP lookup after launch reuses the final wait response."""
+    ec2_manager.ec2_client.run_instances = MagicMock(
+        return_value={"Instances": [{"InstanceId": "i-12345"}]}
     )
+    ec2_manager.ec2_client.describe_instances = MagicMock(return_value=RUNNING_INSTANCE_RESPONSE)
 
-    result = ec2_manager.get_instance_details("i-12345")
+    instance_id = ec2_manager.launch_instance(
+        ami_id="ami-12345",
+        instance_type="t3.small",
+        security_group_id="sg-12345",
+        user_data="#!/bin/bash",
+        instance_name="test-instance",
+    )
 
-    assert result is not None
-    assert result["instance_id"] == "i-12345"
-    assert result["state"] == "stopped"
-    assert result["public_ip"] is None
+    assert instance_id == "i-12345"
+    assert ec2_manager.get_instance_public_ip("i-12345") == "1.2.3.4"
+    ec2_manager.ec2_client.describe_instances.assert_called_once()
@@ -1,6 +1,7 @@
 """Unit tests for IAMManager."""
 
-from unittest.mock import MagicMock, patch
+import json
+from unittest.mock import MagicMock
 import pytest
 from botocore.exceptions import ClientError
 
@@ -10,8 +11,7 @@ from ac_server_manager.iam_manager import IAMManager
 @pytest.fixture
 def iam_manager() -> IAMManager:
     """Create IAMManager instance for testing."""
-    with patch("boto3.client"):
-        return IAMManager("us-east-1")
+    return IAMManager("us-east-1")
 
 
 def test_iam_manager_init(iam_manager: IAMManager) -> None:
@@ -154,8 +154,6 @@ def test_ensure_role_and_instance_profile_handles_permission_error(
 
 def test_attach_s3_policy_creates_correct_policy(iam_manager: IAMManager) -> None:
     """Test that _attach_s3_policy creates correct policy document."""
-    import json
-
     iam_manager.iam_client.put_role_policy = MagicMock()
 
     iam_manager._attach_s3_policy("test-role", "test-bucket")
@@ -182,12 +180,25 @@ def test_attach_s3_policy_creates_correct_policy(iam_manager: IAMManager) -> Non
     assert "arn:aws:s3:::test-bucket" in list_bucket_stmt["Resource"]
 
 
+def test_attach_s3_policy_skips_identical_policy(iam_manager: IAMManager) -> None:
+    """Test that _attach_s3_policy does not rewrite an unchanged policy."""
+    iam_manager.iam_client.put_role_policy = MagicMock()
+    iam_manager._attach_s3_policy("test-role", "test-bucket")
+    existing = json.loads(iam_manager.iam_client.put_role_policy.call_args[1]["PolicyDocument"])
+
+    iam_manager.iam_client.put_role_policy.reset_mock()
+    iam_manager.iam_client.get_role_policy = MagicMock(return_value={"PolicyDocument": existing})
+    iam_manager._attach_s3_policy("test-role", "test-bucket")
+    iam_manager.iam_client.put_role_policy.assert_not_called()
+
+    iam_manager._attach_s3_policy("test-role", "other-bucket")
+    iam_manager.iam_client.put_role_policy.assert_called_once()
+
+
 def test_ensure_role_creates_role_with_ec2_trust_policy(
     iam_manager: IAMManager,
 ) -> None:
     """Test that _ensure_role creates role with correct EC2 trust policy."""
-    import json
-
     # Mock get_role to raise NoSuchEntity
     iam_manager.iam_client.get_role = MagicMock(
         side_effect=ClientError({"Error": {"Code": "NoSuchEntity"}}, "get_role")
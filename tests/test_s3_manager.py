@@ -1,17 +1,21 @@
 """Unit tests for S3Manager."""
 
+import hashlib
+import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
+import boto3.s3.transfer
 import pytest
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 
-from ac_server_manager.s3_manager import S3Manager
+from ac_server_manager.s3_manager import TRANSFER_CONFIG, S3Manager, _preferred_transfer_client
 
 
 @pytest.fixture
 def s3_manager() -> S3Manager:
     """Create S3Manager instance for testing."""
-    with patch("boto3.client"):
-        return S3Manager("test-bucket", "us-east-1")
+    return S3Manager("test-bucket", "us-east-1")
 
 
 def test_s3_manager_init(s3_manager: S3Manager) -> None:
@@ -21,20 +25,19 @@ def test_s3_manager_init(s3_manager: S3Manager) -> None:
 
 
 def test_create_bucket_already_exists(s3_manager: S3Manager) -> None:
-    """Test create_bucket when bucket already exists."""
+    """Test create_bucket does not re-create an existing bucket in us-east-1."""
     s3_manager.s3_client.head_bucket = MagicMock()
+    s3_manager.s3_client.create_bucket = MagicMock()
 
     result = s3_manager.create_bucket()
 
     assert result is True
     s3_manager.s3_client.head_bucket.assert_called_once_with(Bucket="test-bucket")
+    s3_manager.s3_client.create_bucket.assert_not_called()
 
 
 def test_create_bucket_new(s3_manager: S3Manager) -> None:
     """Test create_bucket when creating new bucket."""
-    from botocore.exceptions import ClientError
-
-    # Mock head_bucket to raise 404
     s3_manager.s3_client.head_bucket = MagicMock(
         side_effect=ClientError({"Error": {"Code": "404"}}, "head_bucket")
     )
@@ -43,7 +46,73 @@ def test_create_bucket_new(s3_manager: S3Manager) -> None:
     result = s3_manager.create_bucket()
 
     assert result is True
-    s3_manager.s3_client.create_bucket.assert_called_once()
+    s3_manager.s3_client.create_bucket.assert_called_once_with(Bucket="test-bucket")
+
+
+def test_create_bucket_already_owned_outside_us_east_1() -> None:
+    """Test create_bucket treats an already-owned bucket as success in other regions."""
+    s3_manager = S3Manager("test-bucket", "eu-west-1")
+    s3_manager.s3_client.create_bucket = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "BucketAlreadyOwnedByYou"}}, "create_bucket")
+    )
+    s3_manager.s3_client.head_bucket = MagicMock()
+
+    result = s3_manager.create_bucket()
+
+    assert result is True
+    s3_manager.s3_client.create_bucket.assert_called_once_with(
+        Bucket="test-bucket",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-1"},
+    )
+    s3_manager.s3_client.head_bucket.assert_not_called()
+
+
+def test_create_bucket_taken_by_another_account() -> None:
+    """Test create_bucket fails when the name belongs to someone else."""
+    s3_manager = S3Manager("test-bucket", "eu-west-1")
+    s3_manager.s3_client.create_bucket = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "BucketAlreadyExists"}}, "create_bucket")
+    )
+
+    result = s3_manager.create_bucket()
+
+    assert result is False
+
+
+def test_create_bucket_falls_back_to_head_without_create_permission() -> None:
+    """Test create_bucket accepts an existing bucket when creation is not permitted."""
+    s3_manager = S3Manager("test-bucket", "eu-west-1")
+    s3_manager.s3_client.create_bucket = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "AccessDenied"}}, "create_bucket")
+    )
+    s3_manager.s3_client.head_bucket = MagicMock()
+
+    result = s3_manager.create_bucket()
+
+    assert result is True
+    s3_manager.s3_client.head_bucket.assert_called_once_with(Bucket="test-bucket")
+
+
+def test_preferred_transfer_client_uses_crt_when_installed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test boto3 picks the CRT transfer client when awscrt is installed."""
+    monkeypatch.setitem(sys.modules, "awscrt", MagicMock())
+    monkeypatch.setattr(boto3.s3.transfer, "HAS_CRT", True)
+    monkeypatch.setattr(boto3.s3.transfer, "has_minimum_crt_version", lambda version: True)
+    monkeypatch.setattr(boto3.s3.transfer, "awscrt", MagicMock(), raising=False)
+
+    config = TransferConfig(preferred_transfer_client=_preferred_transfer_client())
+
+    assert config.preferred_transfer_client == "crt"
+    assert boto3.s3.transfer._should_use_crt(config) is True
+
+
+def test_preferred_transfer_client_without_crt(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the classic transfer manager is kept when awscrt is missing."""
+    monkeypatch.setitem(sys.modules, "awscrt", None)
+
+    assert _preferred_transfer_client() == "auto"
 
 
 def test_upload_pack_success(s3_manager: S3Manager, tmp_path: Path) -> None:
@@ -60,6 +129,39 @@ def test_upload_pack_success(s3_manager: S3Manager, tmp_path: Path) -> None:
     s3_manager.s3_client.upload_file.assert_called_once()
 
 
+def test_upload_pack_records_digest(s3_manager: S3Manager, tmp_path: Path) -> None:
+    """Test upload_pack stores the pack SHA-256 in object metadata."""
+    pack_file = tmp_path / "test-pack.tar.gz"
+    pack_file.write_text("test content")
+
+    s3_manager.s3_client.head_object = MagicMock(return_value={"Metadata": {}})
+    s3_manager.s3_client.upload_file = MagicMock()
+
+    s3_manager.upload_pack(pack_file)
+
+    call_args = s3_manager.s3_client.upload_file.call_args
+    assert call_args[1]["ExtraArgs"]["Metadata"]["sha256"] == (
+        hashlib.sha256(b"test content").hexdigest()
+    )
+    assert call_args[1]["Config"] is TRANSFER_CONFIG
+
+
+def test_upload_pack_skips_unchanged(s3_manager: S3Manager, tmp_path: Path) -> None:
+    """Test upload_pack skips the upload when the stored digest matches."""
+    pack_file = tmp_path / "test-pack.tar.gz"
+    pack_file.write_text("test content")
+
+    s3_manager.s3_client.head_object = MagicMock(
+        return_value={"Metadata": {"sha256": hashlib.sha256(b"test content").hexdigest()}}
+    )
+    s3_manager.s3_client.upload_file = MagicMock()
+
+    result = s3_manager.upload_pack(pack_file)
+
+    assert result == "packs/test-pack.tar.gz"
+    s3_manager.s3_client.upload_file.assert_not_called()
+
+
 def test_upload_pack_file_not_found(s3_manager: S3Manager) -> None:
     """Test upload_pack with non-existent file."""
     result = s3_manager.upload_pack(Path("/nonexistent/file.tar.gz"))
@@ -88,24 +190,60 @@ def test_download_pack_success(s3_manager: S3Manager, tmp_path: Path) -> None:
 
     assert result is True
     s3_manager.s3_client.download_file.assert_called_once()
+    assert s3_manager.s3_client.download_file.call_args[1]["Config"] is TRANSFER_CONFIG
+
+
+def test_download_pack_skips_matching_local_file(s3_manager: S3Manager, tmp_path: Path) -> None:
+    """Test download_pack skips the download when the local file is up to date."""
+    download_path = tmp_path / "downloaded-pack.tar.gz"
+    download_path.write_bytes(b"pack contents")
+    s3_manager.s3_client.head_object = MagicMock(
+        return_value={"Metadata": {"sha256": hashlib.sha256(b"pack contents").hexdigest()}}
+    )
+    s3_manager.s3_client.download_file = MagicMock()
+
+    result = s3_manager.download_pack("packs/test.tar.gz", download_path)
+
+    assert result is True
+    s3_manager.s3_client.download_file.assert_not_called()
+
+
+def test_download_pack_replaces_stale_local_file(s3_manager: S3Manager, tmp_path: Path) -> None:
+    """Test download_pack downloads when the local file differs from the pack."""
+    download_path = tmp_path / "downloaded-pack.tar.gz"
+    download_path.write_bytes(b"old contents")
+    s3_manager.s3_client.head_object = MagicMock(return_value={"Metadata": {"sha256": "different"}})
+    s3_manager.s3_client.download_file = MagicMock()
+
+    result = s3_manager.download_pack("packs/test.tar.gz", download_path)
+
+    assert result is True
+    s3_manager.s3_client.download_file.assert_called_once()
 
 
 def test_list_packs_success(s3_manager: S3Manager) -> None:
     """Test listing packs."""
-    s3_manager.s3_client.list_objects_v2 = MagicMock(
-        return_value={"Contents": [{"Key": "packs/pack1.tar.gz"}, {"Key": "packs/pack2.tar.gz"}]}
-    )
+    paginator = MagicMock()
+    paginator.paginate.return_value = [
+        {"Contents": [{"Key": "packs/pack1.tar.gz"}]},
+        {"Contents": [{"Key": "packs/pack2.tar.gz"}]},
+    ]
+    s3_manager.s3_client.get_paginator = MagicMock(return_value=paginator)
 
     result = s3_manager.list_packs()
 
     assert len(result) == 2
     assert "packs/pack1.tar.gz" in result
     assert "packs/pack2.tar.gz" in result
+    s3_manager.s3_client.get_paginator.assert_called_once_with("list_objects_v2")
+    paginator.paginate.assert_called_once_with(Bucket="test-bucket", Prefix="packs/")
 
 
 def test_list_packs_empty(s3_manager: S3Manager) -> None:
     """Test listing packs when bucket is empty."""
-    s3_manager.s3_client.list_objects_v2 = MagicMock(return_value={})
+    paginator = MagicMock()
+    paginator.paginate.return_value = [{"KeyCount": 0}]
+    s3_manager.s3_client.get_paginator = MagicMock(return_value=paginator)
 
     result = s3_manager.list_packs()
 
@@ -124,20 +262,19 @@ def test_delete_pack_success(s3_manager: S3Manager) -> None:
 
 def test_delete_bucket_recursive_bucket_not_found(s3_manager: S3Manager) -> None:
     """Test delete_bucket_recursive when bucket doesn't exist."""
-    from botocore.exceptions import ClientError
-
-    s3_manager.s3_client.head_bucket = MagicMock(
-        side_effect=ClientError({"Error": {"Code": "404"}}, "head_bucket")
+    s3_manager.s3_client.get_bucket_versioning = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "NoSuchBucket"}}, "get_bucket_versioning")
     )
+    s3_manager.s3_client.get_paginator = MagicMock()
 
     result = s3_manager.delete_bucket_recursive()
 
     assert result is True
+    s3_manager.s3_client.get_paginator.assert_not_called()
 
 
 def test_delete_bucket_recursive_non_versioned(s3_manager: S3Manager) -> None:
     """Test delete_bucket_recursive with non-versioned bucket."""
-    s3_manager.s3_client.head_bucket = MagicMock()
     s3_manager.s3_client.get_bucket_versioning = MagicMock(return_value={})
     s3_manager.s3_client.get_paginator = MagicMock(
         return_value=MagicMock(
@@ -158,9 +295,52 @@ def test_delete_bucket_recursive_non_versioned(s3_manager: S3Manager) -> None:
     s3_manager.s3_client.delete_bucket.assert_called_once()
 
 
+def test_delete_bucket_recursive_deletes_every_page(s3_manager: S3Manager) -> None:
+    """Test delete_bucket_recursive issues one bulk delete per listed page."""
+    pages = [{"Contents": [{"Key": f"file{page}-{n}.txt"} for n in range(3)]} for page in range(4)]
+    s3_manager.s3_client.get_bucket_versioning = MagicMock(return_value={})
+    s3_manager.s3_client.get_paginator = MagicMock(
+        return_value=MagicMock(paginate=MagicMock(return_value=pages))
+    )
+    s3_manager.s3_client.delete_objects = MagicMock(
+        side_effect=lambda Bucket, Delete: {"Deleted": Delete["Objects"]}
+    )
+    s3_manager.s3_client.delete_bucket = MagicMock()
+
+    result = s3_manager.delete_bucket_recursive()
+
+    assert result is True
+    assert s3_manager.s3_client.delete_objects.call_count == 4
+    deleted = {
+        obj["Key"]
+        for call in s3_manager.s3_client.delete_objects.call_args_list
+        for obj in call[1]["Delete"]["Objects"]
+    }
+    assert deleted == {f"file{page}-{n}.txt" for page in range(4) for n in range(3)}
+    s3_manager.s3_client.delete_bucket.assert_called_once()
+
+
+def test_delete_bucket_recursive_delete_fails(s3_manager: S3Manager) -> None:
+    """Test delete_bucket_recursive keeps the bucket when a bulk delete fails."""
+    s3_manager.s3_client.get_bucket_versioning = MagicMock(return_value={})
+    s3_manager.s3_client.get_paginator = MagicMock(
+        return_value=MagicMock(
+            paginate=MagicMock(return_value=[{"Contents": [{"Key": "file1.txt"}]}])
+        )
+    )
+    s3_manager.s3_client.delete_objects = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "AccessDenied"}}, "delete_objects")
+    )
+    s3_manager.s3_client.delete_bucket = MagicMock()
+
+    result = s3_manager.delete_bucket_recursive()
+
+    assert result is False
+    s3_manager.s3_client.delete_bucket.assert_not_called()
+
+
 def test_delete_bucket_recursive_versioned(s3_manager: S3Manager) -> None:
     """Test delete_bucket_recursive with versioned bucket."""
-    s3_manager.s3_client.head_bucket = MagicMock()
     s3_manager.s3_client.get_bucket_versioning = MagicMock(return_value={"Status": "Enabled"})
     s3_manager.s3_client.get_paginator = MagicMock(
         return_value=MagicMock(
@@ -191,7 +371,6 @@ def test_delete_bucket_recursive_versioned(s3_manager: S3Manager) -> None:
 
 def test_delete_bucket_recursive_dry_run(s3_manager: S3Manager) -> None:
     """Test delete_bucket_recursive in dry-run mode."""
-    s3_manager.s3_client.head_bucket = MagicMock()
     s3_manager.s3_client.get_bucket_versioning = MagicMock(return_value={})
     s3_manager.s3_client.get_paginator = MagicMock(
         return_value=MagicMock(